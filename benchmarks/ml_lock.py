@@ -0,0 +1,35 @@
+"""
+Micro-benchmark of `ml_lock` template tag used inside loops.
+
+Usage::
+    python benchmarks/ml_lock.py [number of items]
+"""
+import sys
+import timeit
+
+from django.conf import settings
+
+settings.configure(LANGUAGE_CODE='cs', LANGUAGES=(('cs', 'Czech'), ('en', 'English'), ('fr', 'French')),
+                   INSTALLED_APPS=('multilingual', ))
+
+from django.template import Context, Template
+
+
+TEMPLATES = (
+    ('literal', "{% for i in items %}{% ml_lock 'en' %}{{ ML_LANGUAGE }}{% endml_lock %}{% endfor %}"),
+    ('variable', "{% for i in items %}{% ml_lock code %}{{ ML_LANGUAGE }}{% endml_lock %}{% endfor %}"),
+    ('nested', "{% for i in items %}{% ml_lock 'en' %}{% ml_lock code %}{{ ML_LANGUAGE }}{% endml_lock %}"
+               "{% endml_lock %}{% endfor %}"),
+)
+
+
+def main(items=1000, repeat=5, number=10):
+    context = Context({'items': range(items), 'code': 'fr'})
+    for name, source in TEMPLATES:
+        template = Template('{% load multiling %}' + source)
+        best = min(timeit.repeat(lambda: template.render(context), repeat=repeat, number=number)) / number
+        print '%-10s %8.3f ms per render, %6.2f us per tag' % (name, best * 1000, best * 1000000 / items)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -1,6 +1,7 @@
 """
 Support from multilingual usage in django admin
 """
+from multilingual.admin.filters import TranslationListFilter
 from multilingual.admin.inlines import MultilingualInlineModelAdmin, \
     MultilingualStackedInline, MultilingualTabularInline
 from multilingual.admin.options import MultilingualModelAdmin
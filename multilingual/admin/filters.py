@@ -0,0 +1,31 @@
+"""
+List filters for multilingual models
+"""
+from django.contrib.admin import SimpleListFilter
+from django.utils.translation import ugettext_lazy as _, ugettext
+
+from multilingual.languages import get_dict
+
+# Prefix of filter values which select objects with missing translation
+MISSING_PREFIX = '-'
+
+
+class TranslationListFilter(SimpleListFilter):
+    """
+    Filters objects which have or miss translation for a language.
+    """
+    title = _('translation')
+    parameter_name = 'ml_translation'
+
+    def lookups(self, request, model_admin):
+        languages = get_dict().items()
+        return [(code, name) for code, name in languages] + \
+            [(MISSING_PREFIX + code, ugettext('Missing %s') % name) for code, name in languages]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        if value.startswith(MISSING_PREFIX):
+            return queryset.missing_translation(value[len(MISSING_PREFIX):])
+        return queryset.has_translation(value)
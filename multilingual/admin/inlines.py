@@ -3,22 +3,25 @@ Inline model admin for multilingual models
 """
 from django.contrib.admin.options import InlineModelAdmin
 
-from multilingual.forms import MultilingualModelForm
+from multilingual.forms import BaseMultilingualInlineFormSet, MultilingualModelForm
+from multilingual.models.fields import TRANSLATION_FIELD_NAME
 
 
-#TODO: I do not know how to handle languages here, because I can not lock language here
-# Probably the best solution is to create ModelAdmin that enables usage of multilingual inlines.
-# We need to display language tabs somewhere - this might be part of management form
-# We need to include language hidden input - also might be part of management form
-# We need to lock language somewhere, but main code for this is somewhere else
-
-# This is more or less only shell, it requires more changes to be done, so it works properly
-
 class MultilingualInlineModelAdmin(InlineModelAdmin):
     """
     Inline model admin for multilingual models
+
+    Inline forms edit translations for the language locked by `MultilingualModelAdmin`, which shows language tabs and
+    keeps the language in the form. Translations are selected with the inline objects.
     """
     form = MultilingualModelForm
+    formset = BaseMultilingualInlineFormSet
+
+    def get_queryset(self, request):
+        """
+        Returns queryset which selects translations, so they are not loaded for each inline form.
+        """
+        return super(MultilingualInlineModelAdmin, self).get_queryset(request).select_related(TRANSLATION_FIELD_NAME)
 
 
 class MultilingualStackedInline(MultilingualInlineModelAdmin):
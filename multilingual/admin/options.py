@@ -1,14 +1,27 @@
 """
 Model admin for multilingual models
 """
+import operator
+
 from django.contrib.admin import ModelAdmin
+from django.contrib.admin.util import lookup_needs_distinct
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.fields import FieldDoesNotExist
 from django.utils.encoding import force_unicode
-from django.utils.translation import ugettext as _
+from django.utils.html import conditional_escape, format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import ugettext as _, ugettext_lazy
 
-from multilingual.forms import MultilingualModelForm
-from multilingual.languages import get_dict, get_active, lock, release
+from multilingual.admin.views import MultilingualChangeList
+from multilingual.alternates import get_translated_languages
+from multilingual.forms import BaseMultilingualModelFormSet, MultilingualAllLanguagesModelForm, MultilingualModelForm
+from multilingual.languages import get_all, get_dict, get_active, lock, release
+from multilingual.models.fields import TranslationRelation
+from multilingual.models.utils import _get_proxy_or_none, expand_fallback_lookup, expand_lookup
 
-#TODO: Inline model admins
+# Lookups used by prefixes of search fields
+SEARCH_LOOKUPS = {'^': 'istartswith', '=': 'iexact', '@': 'search'}
 
 
 class MultilingualModelAdmin(ModelAdmin):
@@ -16,26 +29,134 @@ class MultilingualModelAdmin(ModelAdmin):
     Model admin for multilingual models
     """
     form = MultilingualModelForm
+    # Edit translations for all languages at once instead of the locked language, inlines use the active language
+    all_languages = False
+    all_languages_form = MultilingualAllLanguagesModelForm
+    # Search translated fields in all languages instead of the active language
+    search_all_languages = False
 
     # use special template to render tabs for languages on top
     change_form_template = "multilingual/admin/change_form.html"
 
-    #TODO: select_related on queryset of required
-    #TODO: select_related on get_object if required
+    def get_translation_relations(self, request):
+        """
+        Returns names of translation relations used by translated fields in `list_display`, `list_filter` and
+        `ordering`, changelist selects them with objects. Search does not need them, see `get_search_results`.
+        """
+        opts = self.model._meta
+        names = list(self.get_list_display(request)) + list(self.get_list_filter(request)) + \
+            list(self.get_ordering(request) or ())
+
+        relations = set()
+        for name in names:
+            if isinstance(name, (list, tuple)):
+                # List filter with filter class
+                name = name[0]
+            if not isinstance(name, basestring):
+                # Callables and list filter classes
+                continue
+            lookup = name.lstrip('-^=@')
+            lookups = expand_fallback_lookup(opts, lookup.split(LOOKUP_SEP)[0])
+            if lookups is None:
+                lookups = [expand_lookup(opts, lookup)]
+            for lookup in lookups:
+                relation_name = lookup.split(LOOKUP_SEP)[0]
+                try:
+                    field = opts.get_field(relation_name)
+                except FieldDoesNotExist:
+                    continue
+                if isinstance(field, TranslationRelation):
+                    relations.add(relation_name)
+        return sorted(relations)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Searches translated fields by single subquery on translation table for each search term.
+
+        Translated fields are searched in the active language, or in all languages if `search_all_languages` is set.
+        Fields with language code or fallback, e.g. `title_en`, search their languages. Prefix `@` uses database
+        full-text search.
+        """
+        opts = self.model._meta
+        lookups = []
+        translation_lookups = []
+        for search_field in self.search_fields:
+            search_field = str(search_field)
+            lookup_type = SEARCH_LOOKUPS.get(search_field[0])
+            if lookup_type is None:
+                lookup_type = 'icontains'
+            else:
+                search_field = search_field[1:]
+
+            parts = search_field.split(LOOKUP_SEP)
+            field = _get_proxy_or_none(opts, parts[0])
+            if field is None:
+                lookups.append(LOOKUP_SEP.join(parts + [lookup_type]))
+                continue
+            if self.search_all_languages and field.name == field.field_name:
+                language_codes = get_all()
+            else:
+                language_codes = field.get_language_codes()
+            lookup = LOOKUP_SEP.join([field.field_name] + parts[1:] + [lookup_type])
+            translation_lookups.append((language_codes, lookup))
+
+        if not search_term or not (lookups or translation_lookups):
+            return queryset, False
+
+        translation_manager = opts.translation_model._default_manager
+        for bit in search_term.split():
+            or_queries = [Q(**{lookup: bit}) for lookup in lookups]
+            if translation_lookups:
+                translation_q = reduce(operator.or_, [Q(language_code__in=language_codes, **{lookup: bit})
+                                                      for language_codes, lookup in translation_lookups])
+                translated = translation_manager.using(queryset.db).filter(translation_q).values('master')
+                or_queries.append(Q(pk__in=translated))
+            queryset = queryset.filter(reduce(operator.or_, or_queries))
+
+        # Translations are searched by subquery, which never returns duplicates
+        use_distinct = any(lookup_needs_distinct(opts, lookup) for lookup in lookups)
+        return queryset, use_distinct
+
+    def get_form(self, request, obj=None, **kwargs):
+        if self.all_languages:
+            kwargs.setdefault('form', self.all_languages_form)
+        return super(MultilingualModelAdmin, self).get_form(request, obj, **kwargs)
+
+    def get_changelist(self, request, **kwargs):
+        return MultilingualChangeList
+
+    def get_changelist_formset(self, request, **kwargs):
+        kwargs.setdefault('formset', BaseMultilingualModelFormSet)
+        return super(MultilingualModelAdmin, self).get_changelist_formset(request, **kwargs)
+
+    def translation_coverage(self, obj):
+        """
+        Changelist column with languages of the object, missing translations are struck through.
+
+        Languages of all listed objects are loaded by single query.
+        """
+        translated = get_translated_languages(obj)
+        return mark_safe(u' '.join(conditional_escape(l) if l in translated else format_html(u'<del>{0}</del>', l)
+                                   for l in get_all()))
+    translation_coverage.allow_tags = True
+    translation_coverage.short_description = ugettext_lazy('translations')
 
     def render_change_form(self, request, context, **kwargs):
         # Since Django 1.4 template rendering is lazy, so we need to add language to context.
         # TODO: Make this a hidden form field.
         context['ml_admin_language'] = get_active()
+        context['ml_admin_all_languages'] = self.all_languages
         return super(MultilingualModelAdmin, self).render_change_form(request, context, **kwargs)
 
     def add_view(self, request, form_url='', extra_context=None):
         """
         Lock language over 'add' view and update context.
         """
-        try:
-            lock(request.POST.get('ml_admin_language', request.GET.get('ml_admin_language', get_active())))
+        if self.all_languages:
+            return super(MultilingualModelAdmin, self).add_view(request, form_url=form_url, extra_context=extra_context)
 
+        lock(request.POST.get('ml_admin_language', request.GET.get('ml_admin_language', get_active())))
+        try:
             model = self.model
             opts = model._meta
             context = {
@@ -53,9 +174,12 @@ class MultilingualModelAdmin(ModelAdmin):
         """
         Lock language over 'change' view and update context.
         """
-        try:
-            lock(request.POST.get('ml_admin_language', request.GET.get('ml_admin_language', get_active())))
+        if self.all_languages:
+            return super(MultilingualModelAdmin, self).change_view(request, object_id, form_url=form_url,
+                                                                   extra_context=extra_context)
 
+        lock(request.POST.get('ml_admin_language', request.GET.get('ml_admin_language', get_active())))
+        try:
             model = self.model
             opts = model._meta
             context = {
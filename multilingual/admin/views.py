@@ -0,0 +1,49 @@
+"""
+Admin views for multilingual models
+"""
+from django.contrib.admin.views.main import ChangeList
+from django.db import models
+
+from multilingual.models.query import prefetch_translated_languages
+
+# Name of the translation coverage column of `MultilingualModelAdmin`
+TRANSLATION_COVERAGE = 'translation_coverage'
+
+
+class MultilingualChangeList(ChangeList):
+    """
+    Change list which selects translations of listed fields and loads translated languages of the listed objects by
+    single query.
+    """
+    def get_queryset(self, request):
+        self.translation_relations = self.model_admin.get_translation_relations(request)
+        return super(MultilingualChangeList, self).get_queryset(request)
+
+    def apply_select_related(self, qs):
+        if not self.translation_relations or self.list_select_related is True:
+            # Relations can not be added to select of all relations
+            return super(MultilingualChangeList, self).apply_select_related(qs)
+        if self.list_select_related is False:
+            relations = self.get_related_fields_in_list_display()
+        else:
+            relations = list(self.list_select_related)
+        return qs.select_related(*(relations + self.translation_relations))
+
+    def get_related_fields_in_list_display(self):
+        """
+        Returns names of foreign keys in `list_display`, which are selected with objects by `ChangeList`.
+        """
+        names = []
+        for field_name in self.list_display:
+            try:
+                field = self.lookup_opts.get_field(field_name)
+            except models.FieldDoesNotExist:
+                continue
+            if isinstance(field.rel, models.ManyToOneRel):
+                names.append(field_name)
+        return names
+
+    def get_results(self, request):
+        super(MultilingualChangeList, self).get_results(request)
+        if TRANSLATION_COVERAGE in self.list_display:
+            prefetch_translated_languages(self.result_list)
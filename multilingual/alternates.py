@@ -0,0 +1,65 @@
+"""
+URLs of objects in alternate languages, e.g. for language switchers and `hreflang` links.
+"""
+from django.utils import translation
+from django.utils.datastructures import SortedDict
+
+from multilingual.languages import get_all, locked
+from multilingual.models.base import MultilingualModel
+from multilingual.models.fields import TRANSLATED_LANGUAGES_ATTR, TRANSLATION_FIELD_NAME
+from multilingual.utils import sanitize_language_code
+
+
+# Instance attribute with cached alternate URLs
+ALTERNATE_URLS_ATTR = '_alternate_urls'
+
+
+def get_translated_languages(obj, language_codes=None):
+    """
+    Returns list of languages the multilingual object is translated to, all languages by default.
+
+    Languages cached by `multilingual.models.query.prefetch_translated_languages` or translations already loaded into
+    the object are used, otherwise all languages are checked by single query.
+    """
+    if language_codes is None:
+        language_codes = get_all()
+    if hasattr(obj, TRANSLATED_LANGUAGES_ATTR):
+        translated = getattr(obj, TRANSLATED_LANGUAGES_ATTR)
+        return [l for l in language_codes if l in translated]
+
+    translations = {}
+    for language_code in language_codes:
+        cache_name = '_%s_%s_cache' % (TRANSLATION_FIELD_NAME, sanitize_language_code(language_code))
+        if not hasattr(obj, cache_name):
+            break
+        translations[language_code] = getattr(obj, cache_name)
+    else:
+        return [l for l in language_codes if translations[l] is not None]
+
+    translation_model = obj._meta.translation_model
+    translated = set(translation_model._default_manager.filter(master=obj.pk, language_code__in=language_codes)
+                     .values_list('language_code', flat=True))
+    return [l for l in language_codes if l in translated]
+
+
+def get_alternate_urls(obj, language_codes=None):
+    """
+    Returns dictionary with URLs of the object for each language the object is available in, all languages by default.
+
+    URL is result of `get_absolute_url` called with the language locked and activated. Multilingual objects are
+    available only in languages they are translated to. Results are cached in the object.
+    """
+    if language_codes is None:
+        language_codes = get_all()
+    cache = obj.__dict__.setdefault(ALTERNATE_URLS_ATTR, {})
+    key = tuple(language_codes)
+    if key not in cache:
+        if isinstance(obj, MultilingualModel):
+            language_codes = get_translated_languages(obj, language_codes)
+        urls = SortedDict()
+        for language_code in language_codes:
+            with locked(language_code):
+                with translation.override(language_code):
+                    urls[language_code] = obj.get_absolute_url()
+        cache[key] = urls
+    return cache[key]
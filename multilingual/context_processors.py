@@ -3,12 +3,28 @@ Multilingual context processor
 
 Context variables:
   * ML_LANGUAGE - active language for multilingual usage
+  * ML_LANGUAGES - list of language codes
+  * ML_LANGUAGE_NAMES - dictionary of language names by language code
+  * ML_FALLBACKS - list of fallback languages for active language
+
+All values are lazy, they are evaluated only when they are used.
 """
-from multilingual.languages import get_active
+from django.utils import six
+from django.utils.datastructures import SortedDict
+from django.utils.functional import lazy
+
+from multilingual.languages import get_active, get_all, get_dict, get_fallbacks
+
+
+def _get_active_fallbacks():
+    return get_fallbacks(get_active())
 
 
 def multilingual(request):
     """
     Returns context variables containing information about available languages.
     """
-    return {'ML_LANGUAGE': get_active()}
+    return {'ML_LANGUAGE': lazy(get_active, six.text_type)(),
+            'ML_LANGUAGES': lazy(get_all, list)(),
+            'ML_LANGUAGE_NAMES': lazy(get_dict, SortedDict)(),
+            'ML_FALLBACKS': lazy(_get_active_fallbacks, list)()}
@@ -1,10 +1,217 @@
 """
 Model form for multilingual models
 """
-from django.forms.models import model_to_dict, fields_for_model, ModelFormMetaclass, ModelForm, ALL_FIELDS
+import copy
+import operator
+import sys
+from functools import partial
+from types import FunctionType
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db.models import Q
+from django.forms.fields import Field
+from django.forms.models import (model_to_dict, fields_for_model, modelform_factory, BaseInlineFormSet,
+                                 BaseModelFormSet, ModelFormMetaclass, ModelForm, ALL_FIELDS)
 from django.forms.util import ErrorList
 
-from multilingual.languages import get_active
+from multilingual.languages import get_active, get_dict
+from multilingual.models.fields import BOUND_LANGUAGE_ATTR, TRANSLATION_CHANGED_ATTR, TRANSLATION_FIELD_NAME
+from multilingual.utils import sanitize_language_code
+
+# Fields of translation model which are not edited in forms
+TRANSLATION_BASE_FIELDS = ('id', 'language_code', 'master')
+
+# Model admin methods which create form fields
+ADMIN_FORMFIELD_HOOKS = ('formfield_for_dbfield', 'formfield_for_foreignkey', 'formfield_for_manytomany',
+                         'formfield_for_choice_field')
+
+# Caches of form fields and form classes generated for translation models
+_translation_fields_cache = {}
+_translation_form_cache = {}
+
+
+def _freeze(value):
+    # Returns hashable version of form option which is equal for equal options, None if there is none
+    if isinstance(value, (basestring, type)):
+        return (value, )
+    if isinstance(value, (list, tuple)):
+        items = tuple(_freeze(v) for v in value)
+        return None if None in items else (items, )
+    if isinstance(value, dict):
+        return _freeze(sorted(value.items()))
+    # Widget instances and other objects are compared by identity, they would never hit the cache
+    return None
+
+
+def _freeze_callback(callback, translation_model):
+    # Returns cache key of formfield callback or None if it may be different for each form class
+    if isinstance(callback, partial) and not callback.args and callback.keywords.keys() == ['request']:
+        # Admin binds request to `formfield_for_dbfield` for each form class. Default hooks use the request only for
+        # relations, so fields are cached for admin class which does not override them.
+        model_admin = getattr(callback.func, '__self__', None)
+        if callback.func.__name__ != 'formfield_for_dbfield' or not hasattr(model_admin, 'admin_site'):
+            return None
+        admin_class = type(model_admin)
+        if admin_class.formfield_overrides or any(
+                getattr(admin_class, name).__func__.__module__ != 'django.contrib.admin.options'
+                for name in ADMIN_FORMFIELD_HOOKS):
+            return None
+        opts = translation_model._meta
+        if any(f.rel for f in opts.fields + opts.many_to_many if f.name not in TRANSLATION_BASE_FIELDS):
+            return None
+        return (admin_class, model_admin.admin_site)
+    if isinstance(callback, FunctionType) and \
+            getattr(sys.modules.get(callback.__module__), callback.__name__, None) is callback:
+        # Module level functions
+        return (callback, )
+    return None
+
+
+def _get_cache_key(translation_model, fields, exclude, widgets, formfield_callback):
+    # Returns key of caches for the form options or None if the options can not be cached
+    key = (translation_model, ) + tuple(_freeze(v) if v is not None else () for v in (fields, exclude, widgets))
+    if formfield_callback is not None:
+        key += (_freeze_callback(formfield_callback, translation_model), )
+    if None in key:
+        return None
+    return key
+
+
+def translation_fields_for_model(translation_model, fields=None, exclude=None, widgets=None, formfield_callback=None):
+    """
+    Returns form fields for translation model like `fields_for_model`, fields are cached for the same options.
+
+    Options are cached only if they are equal for each call, i.e. they do not contain widget instances and the
+    callback is a module level function or `formfield_for_dbfield` of admin class which does not override form field
+    hooks.
+    """
+    key = _get_cache_key(translation_model, fields, exclude, widgets, formfield_callback)
+    if key is None:
+        return fields_for_model(translation_model, fields, exclude, widgets, formfield_callback)
+    if key not in _translation_fields_cache:
+        _translation_fields_cache[key] = fields_for_model(translation_model, fields, exclude, widgets,
+                                                          formfield_callback)
+
+    # Deep copies with new creation counters keep order of fields declared by forms
+    model_fields = _translation_fields_cache[key].copy()
+    for field_name, field in model_fields.items():
+        if field is not None:
+            field = copy.deepcopy(field)
+            field.error_messages = field.error_messages.copy()
+            field.creation_counter = Field.creation_counter
+            Field.creation_counter += 1
+            model_fields[field_name] = field
+    return model_fields
+
+
+def translation_modelform_factory(translation_model, fields=None, exclude=None, widgets=None,
+                                  formfield_callback=None):
+    """
+    Returns model form class for translation model like `modelform_factory`, classes are cached for the same options.
+    """
+    key = _get_cache_key(translation_model, fields, exclude, widgets, formfield_callback)
+    if key is None:
+        return modelform_factory(translation_model, fields=fields, exclude=exclude, widgets=widgets,
+                                 formfield_callback=formfield_callback)
+    if key not in _translation_form_cache:
+        _translation_form_cache[key] = modelform_factory(translation_model, fields=fields, exclude=exclude,
+                                                         widgets=widgets, formfield_callback=formfield_callback)
+    return _translation_form_cache[key]
+
+
+def _get_translation_cache_name(language_code):
+    # Returns name of the instance attribute with cached translation
+    return '_%s_%s_cache' % (TRANSLATION_FIELD_NAME, sanitize_language_code(language_code))
+
+
+def load_translations(instances):
+    """
+    Loads translations of multilingual instances which are not loaded yet and caches them in the instances.
+
+    Translations in the language of the instances are loaded by single query, active language is used unless
+    the instances are bound to a language.
+    """
+    by_language = {}
+    for instance in instances:
+        language_code = getattr(instance, BOUND_LANGUAGE_ATTR, None) or get_active()
+        if instance.pk is not None and not hasattr(instance, _get_translation_cache_name(language_code)):
+            by_language.setdefault(language_code, []).append(instance)
+
+    for language_code, instances in by_language.items():
+        translation_model = instances[0]._meta.translation_model
+        translations = dict((t.master_id, t) for t in translation_model._default_manager.filter(
+            master__in=[i.pk for i in instances], language_code=language_code))
+        for instance in instances:
+            setattr(instance, _get_translation_cache_name(language_code), translations.get(instance.pk))
+
+
+def _get_unique_checks(translation_model, field_names):
+    # Returns unique checks of translation model without language code which consist only of the fields
+    checks = []
+    for check in translation_model._meta.unique_together:
+        check = tuple(f for f in check if f != 'language_code')
+        if check and 'master' not in check and all(f in field_names for f in check):
+            checks.append(check)
+    return checks
+
+
+def get_unique_conflicts(translation_model, translations, master_pk=None):
+    """
+    Returns list of language codes and unique checks of translations which conflict with other objects.
+
+    `translations` is a list of language codes, dictionaries of translated field values and names of changed fields.
+    Only unique checks with a changed field are done, all of them by single query. Translations of `master_pk` are
+    not considered conflicting.
+    """
+    checks = []
+    for language_code, values, changed in translations:
+        for check in _get_unique_checks(translation_model, values):
+            lookups = dict((f, values[f]) for f in check)
+            # Null values are never unique, as in django unique checks
+            if any(f in changed for f in check) and None not in lookups.values():
+                checks.append((language_code, check, lookups))
+    if not checks:
+        return []
+
+    queryset = translation_model._default_manager.filter(
+        reduce(operator.or_, [Q(language_code=language_code, **lookups) for language_code, check, lookups in checks]))
+    if master_pk is not None:
+        queryset = queryset.exclude(master=master_pk)
+    field_names = sorted(set(f for language_code, check, lookups in checks for f in check))
+    rows = [dict(zip(['language_code'] + field_names, row))
+            for row in queryset.values_list('language_code', *field_names)]
+
+    # Each row matches a check of its language in the database, which may convert values or ignore case. Row which
+    # does not match any check by value is attributed to all checks of its language.
+    opts = translation_model._meta
+    matched = set()
+    for row in rows:
+        candidates = [i for i, (language_code, check, lookups) in enumerate(checks)
+                      if language_code == row['language_code']]
+        for ignore_case in (False, True):
+            found = [i for i in candidates if all(
+                _get_unique_value(opts.get_field(f), row[f], ignore_case) ==
+                _get_unique_value(opts.get_field(f), v, ignore_case) for f, v in checks[i][2].items())]
+            if found:
+                break
+        matched.update(found or candidates)
+    return [(language_code, check) for i, (language_code, check, lookups) in enumerate(checks) if i in matched]
+
+
+def _get_unique_value(field, value, ignore_case=False):
+    # Returns value of unique check converted to the field type
+    value = field.to_python(value)
+    if ignore_case and isinstance(value, basestring):
+        return value.lower()
+    return value
+
+
+def _get_unique_error(translation_model, check):
+    # Returns validation error for failed unique check, single field checks are errors of the field
+    message = translation_model().unique_error_message(translation_model, check)
+    if len(check) == 1:
+        return ValidationError({check[0]: [message]})
+    return ValidationError({NON_FIELD_ERRORS: [message]})
 
 
 class MultilingualModelFormMetaclass(ModelFormMetaclass):
@@ -15,6 +222,7 @@ class MultilingualModelFormMetaclass(ModelFormMetaclass):
         """
         Declares multilingual fields before constructor of model form is called.
         """
+        translated_fields = None
         if 'Meta' in attrs:
             meta = attrs.get('Meta')
             if getattr(meta, 'model', None):
@@ -23,9 +231,9 @@ class MultilingualModelFormMetaclass(ModelFormMetaclass):
                     # Exclude translation base fields
                     exclude = getattr(meta, 'exclude', None)
                     if exclude is None:
-                        exclude = ('id', 'language_code', 'master')
+                        exclude = TRANSLATION_BASE_FIELDS
                     else:
-                        exclude = list(exclude) + ['id', 'language_code', 'master']
+                        exclude = list(exclude) + list(TRANSLATION_BASE_FIELDS)
                     fields = getattr(meta, 'fields', None)
                     widgets = getattr(meta, 'widgets', None)
                     formfield_callback = attrs.get('formfield_callback', None)
@@ -35,12 +243,19 @@ class MultilingualModelFormMetaclass(ModelFormMetaclass):
                         # fields from the model"
                         fields = None
 
-                    model_fields = fields_for_model(translation_model, fields, exclude, widgets, formfield_callback)
+                    model_fields = translation_fields_for_model(translation_model, fields, exclude, widgets,
+                                                                formfield_callback)
+                    translated_fields = []
                     for field_name, field in model_fields.items():
                         # Exclude untranslated fields
                         if field is not None:
                             attrs.setdefault(field_name, field)
-        return super(MultilingualModelFormMetaclass, cls).__new__(cls, name, bases, attrs)
+                            translated_fields.append(field_name)
+        new_class = super(MultilingualModelFormMetaclass, cls).__new__(cls, name, bases, attrs)
+        if translated_fields is not None:
+            # Names of translated fields, so they do not have to be searched for
+            new_class._translated_fields = tuple(translated_fields)
+        return new_class
 
 
 class MultilingualModelForm(ModelForm):
@@ -48,8 +263,8 @@ class MultilingualModelForm(ModelForm):
     Alters django model form update initials with data from translation model
     """
     __metaclass__ = MultilingualModelFormMetaclass
+    _translated_fields = ()
 
-    #TODO: unique checks and validation
     def __init__(self, data=None, files=None, auto_id='id_%s', prefix=None,
                  initial=None, error_class=ErrorList, label_suffix=':',
                  empty_permitted=False, instance=None):
@@ -60,37 +275,209 @@ class MultilingualModelForm(ModelForm):
         if not instance:
             return
 
-        # Create empty translation if not exists
-        if not hasattr(self.instance, 'translation') or self.instance.translation is None:
-            self.instance.translation = self.instance._meta.translation_model(master=self.instance,
-                                                                              language_code=get_active())
+        # Translation is created only if translated fields are changed, empty one provides only initial data.
+        translation = self.instance.translation
+        if translation is None:
+            # Remember the translation does not exist
+            setattr(self.instance, self._get_translation_cache_name(), None)
+            translation = self.instance._meta.translation_model(language_code=self._get_language_code())
 
         opts = self._meta
-        exclude = ['id', 'language_code', 'master']
+        exclude = list(TRANSLATION_BASE_FIELDS)
         if opts.exclude is not None:
             exclude.extend(opts.exclude)
-        object_data = model_to_dict(self.instance.translation, opts.fields, exclude)
+        object_data = model_to_dict(translation, opts.fields, exclude)
         for key, value in object_data.iteritems():
             self.initial.setdefault(key, value)
 
+    def _get_language_code(self):
+        # Returns language of the edited translation
+        return getattr(self.instance, BOUND_LANGUAGE_ATTR, None) or get_active()
+
+    def _get_translation_cache_name(self):
+        # Returns name of the instance attribute with cached translation
+        return _get_translation_cache_name(self._get_language_code())
+
+    def validate_unique(self):
+        """
+        Validates unique constraints of the instance and its translation, translation is checked by single query.
+        """
+        super(MultilingualModelForm, self).validate_unique()
+
+        values = dict((f, self.cleaned_data[f]) for f in self._translated_fields if f in self.cleaned_data)
+        translation_model = self.instance._meta.translation_model
+        conflicts = get_unique_conflicts(translation_model, [(self._get_language_code(), values, self.changed_data)],
+                                         self.instance.pk)
+        for language_code, check in conflicts:
+            self._update_errors(_get_unique_error(translation_model, check))
+
     def _post_clean(self):
         """
-        Stores translation data into translation instance
+        Stores changed translation data into translation instance
         """
         # Update master instance
         super(MultilingualModelForm, self)._post_clean()
 
-        # Update translations
-        instance = self.instance
-        fields = self._meta.fields
-        exclude = self._meta.exclude
+        # Update translation only with changed fields
+        changed_fields = [f for f in self._translated_fields if f in self.cleaned_data and f in self.changed_data]
+        for field_name in changed_fields:
+            setattr(self.instance, field_name, self.cleaned_data[field_name])
+        translation = self.instance.__dict__.get(self._get_translation_cache_name())
+        if not changed_fields and translation is not None and not getattr(translation, TRANSLATION_CHANGED_ATTR, False):
+            # Translation is kept loaded, but it is not written when the instance is saved
+            setattr(translation, TRANSLATION_CHANGED_ATTR, False)
 
-        # Most effective is to do something like `construct_instance` for virtual fields.
-        for f in self.instance._meta.virtual_fields:
-            if not f.name in self.cleaned_data:
-                continue
-            if fields is not None and f.name not in fields:
-                continue
-            if exclude and f.name in exclude:
+
+class MultilingualAllLanguagesModelFormMetaclass(ModelFormMetaclass):
+    """
+    Alters django model form to create form class for translations
+    """
+    def __new__(cls, name, bases, attrs):
+        """
+        Creates translation form class from translated fields in `Meta` options.
+        """
+        meta = attrs.get('Meta')
+        if meta is not None and getattr(meta, 'model', None):
+            translation_model = getattr(meta.model._meta, 'translation_model', None)
+            if translation_model:
+                translated = [f.name for f in translation_model._meta.fields if f.name not in TRANSLATION_BASE_FIELDS]
+                fields = getattr(meta, 'fields', None)
+                exclude = getattr(meta, 'exclude', None) or ()
+
+                # Translated fields are restricted only if `fields` contains any, admin lists only master fields
+                translation_fields = None
+                if fields is not None and fields != ALL_FIELDS:
+                    translation_fields = [f for f in fields if f in translated] or None
+                    # Translated fields are unknown to the model form
+                    attrs['Meta'] = type(meta)('Meta', (meta, ), {'fields': [f for f in fields if f not in translated]})
+                translation_exclude = list(TRANSLATION_BASE_FIELDS) + [f for f in exclude if f in translated]
+
+                attrs['translation_form_class'] = translation_modelform_factory(
+                    translation_model, fields=translation_fields, exclude=translation_exclude,
+                    widgets=getattr(meta, 'widgets', None), formfield_callback=attrs.get('formfield_callback'))
+        return super(MultilingualAllLanguagesModelFormMetaclass, cls).__new__(cls, name, bases, attrs)
+
+
+class MultilingualAllLanguagesModelForm(ModelForm):
+    """
+    Model form which edits translations for all languages at once
+
+    Translated fields are edited by `translation_forms`, one form for each language prefixed by its language code.
+    Translations are loaded by single query, forms for missing translations may be left empty.
+    """
+    __metaclass__ = MultilingualAllLanguagesModelFormMetaclass
+
+    def __init__(self, data=None, files=None, auto_id='id_%s', prefix=None,
+                 initial=None, error_class=ErrorList, label_suffix=':',
+                 empty_permitted=False, instance=None):
+        super(MultilingualAllLanguagesModelForm, self).__init__(data, files, auto_id, prefix, initial, error_class,
+                                                                label_suffix, empty_permitted, instance)
+
+        translation_model = self._meta.model._meta.translation_model
+        translations = {}
+        if self.instance.pk is not None:
+            translations = dict((t.language_code, t)
+                                for t in translation_model._default_manager.filter(master=self.instance.pk))
+
+        self.translation_forms = []
+        for language_code, language_name in get_dict().items():
+            translation = translations.get(language_code)
+            if translation is None:
+                translation = translation_model(language_code=language_code)
+            form = self.translation_form_class(data, files, auto_id, self.add_prefix(language_code),
+                                               error_class=error_class, label_suffix=label_suffix,
+                                               empty_permitted=translation.pk is None, instance=translation)
+            form.language_code = language_code
+            form.language_name = language_name
+            self.translation_forms.append(form)
+
+    @property
+    def media(self):
+        media = super(MultilingualAllLanguagesModelForm, self).media
+        for form in self.translation_forms:
+            media = media + form.media
+        return media
+
+    def _post_clean(self):
+        super(MultilingualAllLanguagesModelForm, self)._post_clean()
+        # Validate all translation forms, their errors are collected under prefixed field names
+        if all([form.is_valid() for form in self.translation_forms]):
+            self.validate_translations_unique()
+        for form in self.translation_forms:
+            for name, errors in form.errors.items():
+                self._errors[form.add_prefix(name)] = errors
+
+    def validate_translations_unique(self):
+        """
+        Validates unique constraints of changed translations for all languages by single query.
+        """
+        forms = dict((form.language_code, form) for form in self.translation_forms if form.has_changed())
+        translation_model = self._meta.model._meta.translation_model
+        conflicts = get_unique_conflicts(
+            translation_model, [(l, form.cleaned_data, form.changed_data) for l, form in forms.items()],
+            self.instance.pk)
+        for language_code, check in conflicts:
+            forms[language_code]._update_errors(_get_unique_error(translation_model, check))
+
+    def has_changed(self):
+        return super(MultilingualAllLanguagesModelForm, self).has_changed() or \
+            any(form.has_changed() for form in self.translation_forms)
+
+    def save(self, commit=True):
+        """
+        Saves the instance and its translations, translations are saved by `save_m2m` if `commit` is False.
+        """
+        instance = super(MultilingualAllLanguagesModelForm, self).save(commit)
+        if commit:
+            self.save_translations()
+        else:
+            save_m2m = self.save_m2m
+
+            def save_related():
+                save_m2m()
+                self.save_translations()
+            self.save_m2m = save_related
+        return instance
+
+    def save_translations(self):
+        """
+        Saves changed translations, new translations are created by single query.
+        """
+        created = []
+        for form in self.translation_forms:
+            if not form.has_changed():
                 continue
-            setattr(instance, f.name, self.cleaned_data[f.name])
+            translation = form.instance
+            translation.master = self.instance
+            if translation.pk is None:
+                created.append(translation)
+            else:
+                translation.save()
+            # Drop translation cached in the instance
+            self.instance.__dict__.pop(_get_translation_cache_name(form.language_code), None)
+        if created:
+            self._meta.model._meta.translation_model._default_manager.bulk_create(created)
+
+
+class MultilingualFormSetMixin(object):
+    """
+    Loads translations for all objects of model formset by single query, so forms do not load them one by one.
+    """
+    def get_queryset(self):
+        queryset = super(MultilingualFormSetMixin, self).get_queryset()
+        if not getattr(self, '_translations_loaded', False):
+            load_translations(queryset)
+            self._translations_loaded = True
+        return queryset
+
+
+class BaseMultilingualModelFormSet(MultilingualFormSetMixin, BaseModelFormSet):
+    """
+    Model formset for multilingual models
+    """
+
+
+class BaseMultilingualInlineFormSet(MultilingualFormSetMixin, BaseInlineFormSet):
+    """
+    Inline formset for multilingual models
+    """
@@ -1,33 +1,64 @@
 """
 Pre-processing of language settings and other language related functions.
 """
+from functools import wraps
 from threading import local
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.dispatch import receiver
+from django.test.signals import setting_changed
 from django.utils.datastructures import SortedDict
+from django.utils.encoding import force_text
 from django.utils.translation import get_language
 
 
 FALLBACK_FIELD_SUFFIX = 'any'
+# Lookup which matches translations in any language, e.g. `title__anylang__icontains`
+ANY_LANGUAGE_LOOKUP = 'anylang'
 
-#TODO: enable locks included in each other
-#TODO: decorator for language locks
+# Stack of locked languages, local for each thread (or greenlet if threads are patched)
 _lock = local()
+# Cache of languages from LANGUAGES setting
+_registry = {}
+
+
+@receiver(setting_changed)
+def _clear_registry(sender, setting, **kwargs):
+    # Languages are cached, so clear the cache when settings change, e.g. in tests.
+    if setting == 'LANGUAGES':
+        _registry.clear()
+
+
+def _get_registry():
+    # Returns cached dictionary of languages and set of their codes
+    try:
+        return _registry['dict'], _registry['codes']
+    except KeyError:
+        languages = SortedDict(settings.LANGUAGES)
+        _registry['dict'], _registry['codes'] = languages, frozenset(languages)
+        return languages, _registry['codes']
 
 
 def get_dict():
     """
     So far only wrapper on LANGUAGES setting.
     """
-    return SortedDict(settings.LANGUAGES)
+    return _get_registry()[0].copy()
 
 
 def get_all():
     """
     Returns tuple of defined language codes.
     """
-    return get_dict().keys()
+    return _get_registry()[0].keys()
+
+
+def is_valid(language_code):
+    """
+    Returns whether language is defined in LANGUAGES setting.
+    """
+    return language_code in _get_registry()[1]
 
 
 def get_settings_default():
@@ -36,7 +67,7 @@ def get_settings_default():
     @raise ImproperlyConfigured: If LANGUAGE_CODE is not in LANGUAGES.
     """
     #TODO: move it so it is checked only once
-    if settings.LANGUAGE_CODE not in get_all():
+    if not is_valid(settings.LANGUAGE_CODE):
         raise ImproperlyConfigured(
             "LANGUAGE_CODE '%s' is not one of LANGUAGES." \
             "Set one of LANGUAGES as LANGUAGE_CODE or add '%s' to LANGUAGES."
@@ -45,27 +76,72 @@ def get_settings_default():
     return settings.LANGUAGE_CODE
 
 
+def _get_lock_stack():
+    # Returns stack of locked languages for current thread
+    try:
+        return _lock.stack
+    except AttributeError:
+        _lock.stack = []
+        return _lock.stack
+
+
 def lock(language_code):
     """
     Locks language and disables fallbacks
+
+    Locks can be nested, each lock has to be released by `release`.
     """
-    if language_code not in get_all():
+    # Lazy language code would be evaluated by `get_active` while it is locked
+    language_code = force_text(language_code)
+    if not is_valid(language_code):
         raise ValueError("Invalid language '%s'" % language_code)
-    _lock.value = language_code
+    _get_lock_stack().append(language_code)
 
 
 def release():
     """
-    Releases language lock
+    Releases the last language lock, previous lock is restored.
     """
-    if hasattr(_lock, "value"):
-        del _lock.value
+    stack = _get_lock_stack()
+    if stack:
+        stack.pop()
+
 
 def is_locked():
     """
     Returns state of lock
     """
-    return hasattr(_lock, "value")
+    return bool(getattr(_lock, "stack", None))
+
+
+class locked(object):
+    """
+    Context manager and decorator which locks language, previous lock is restored on exit.
+
+    Examples::
+        with locked('cs'):
+            ...
+
+        @locked('cs')
+        def func():
+            ...
+    """
+    def __init__(self, language_code):
+        self.language_code = language_code
+
+    def __enter__(self):
+        lock(self.language_code)
+        return self.language_code
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        release()
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
 
 
 def get_active():
@@ -78,16 +154,16 @@ def get_active():
     """
     # Check locked languages
     # This might be faster than call is_locked() method
-    language_code = getattr(_lock, "value", None)
-    if language_code is not None:
-        return language_code
+    stack = getattr(_lock, "stack", None)
+    if stack:
+        return stack[-1]
 
     # Get language from django
     language_code = get_language()
-    if language_code not in get_all():
+    if not is_valid(language_code):
         # Try to use only first component
         parts = language_code.split('-', 1)
-        if len(parts) == 2 and parts[0] in get_all():
+        if len(parts) == 2 and is_valid(parts[0]):
             language_code = parts[0]
         else:
             # Get default language from settings
@@ -107,7 +183,7 @@ def get_fallbacks(language_code):
     """
     fallbacks = []
     language = language_code[:2]
-    if language != language_code and language in get_all():
+    if language != language_code and is_valid(language):
         fallbacks.append(language)
 
     language = get_settings_default()
@@ -0,0 +1,37 @@
+"""
+Utilities shared by flat page import and export commands.
+"""
+from multilingual.mlflatpages.models import FlatPage
+
+
+# Translation fields which are not exported
+TRANSLATION_BASE_FIELDS = ('id', 'language_code', 'master')
+
+
+def get_page_fields():
+    """
+    Returns list of exported flat page fields.
+    """
+    return [f for f in FlatPage._meta.local_concrete_fields if not f.primary_key]
+
+
+def get_translation_fields():
+    """
+    Returns list of exported flat page translation fields.
+    """
+    translation_model = FlatPage._meta.translation_model
+    return [f for f in translation_model._meta.local_concrete_fields if f.name not in TRANSLATION_BASE_FIELDS]
+
+
+def chunks(iterable, size):
+    """
+    Yields lists of at most `size` items from `iterable`.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,68 @@
+"""
+Exports flat pages with their translations and sites as JSON lines.
+"""
+import json
+import time
+from collections import defaultdict
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from multilingual.mlflatpages.models import FlatPage
+
+from ._utils import get_page_fields, get_translation_fields
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', default=500, dest='batch_size', type='int',
+            help='Number of flat pages loaded from database at once.'),
+    )
+    help = "Outputs all flat pages with their translations and sites as JSON lines."
+
+    def handle(self, *args, **options):
+        batch_size = options.get('batch_size')
+        verbosity = int(options.get('verbosity'))
+        translation_model = FlatPage._meta.translation_model
+        through_model = FlatPage.sites.through
+        page_fields = [f.attname for f in get_page_fields()]
+        translation_fields = [f.attname for f in get_translation_fields()]
+
+        start = time.time()
+        count = 0
+        last_pk = None
+        while True:
+            # Paginate by primary key, so only one batch is held in memory
+            queryset = FlatPage.objects.order_by('pk')
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            pages = list(queryset.values('pk', *page_fields)[:batch_size])
+            if not pages:
+                break
+            pks = [page['pk'] for page in pages]
+
+            translations = defaultdict(dict)
+            for data in translation_model.objects.filter(master__in=pks).values('master', 'language_code',
+                                                                                *translation_fields):
+                translations[data.pop('master')][data.pop('language_code')] = data
+
+            sites = defaultdict(list)
+            for page_id, site_id in through_model.objects.filter(flatpage__in=pks).order_by('site') \
+                    .values_list('flatpage', 'site'):
+                sites[page_id].append(site_id)
+
+            for page in pages:
+                pk = page.pop('pk')
+                page['id'] = pk
+                page['sites'] = sites[pk]
+                page['translations'] = translations[pk]
+                self.stdout.write(json.dumps(page, cls=DjangoJSONEncoder, sort_keys=True))
+
+            count += len(pages)
+            last_pk = pks[-1]
+
+        if verbosity >= 1:
+            elapsed = time.time() - start
+            self.stderr.write("Exported %d flat pages in %.2f s (%.0f pages/s)."
+                              % (count, elapsed, count / elapsed if elapsed else 0))
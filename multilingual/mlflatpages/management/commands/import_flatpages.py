@@ -0,0 +1,235 @@
+"""
+Imports flat pages with their translations and sites from JSON lines.
+"""
+import json
+import sys
+import time
+from collections import defaultdict
+from optparse import make_option
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.datastructures import SortedDict
+
+from multilingual.languages import get_all
+from multilingual.mlflatpages.models import FlatPage
+
+from ._utils import chunks, get_page_fields, get_translation_fields
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', default=500, dest='batch_size', type='int',
+            help='Number of flat pages imported in one transaction.'),
+        make_option('--match', default='url', dest='match', type='choice', choices=['url', 'id'],
+            help="Match imported flat pages to existing ones by 'url' and sites (default) or by 'id'."),
+    )
+    help = ("Imports flat pages from JSON lines created by 'export_flatpages'. Flat pages are matched by URL and "
+            "sites, or by id with --match=id, their translations and sites are replaced by imported ones.")
+    args = '[file]'
+
+    def handle(self, *args, **options):
+        if len(args) > 1:
+            raise CommandError("Only one file can be imported at once.")
+        batch_size = options.get('batch_size')
+        self.match = options.get('match')
+        verbosity = int(options.get('verbosity'))
+
+        if not args or args[0] == '-':
+            stream = sys.stdin
+        else:
+            try:
+                stream = open(args[0])
+            except IOError as error:
+                raise CommandError("Unable to open file '%s': %s" % (args[0], error))
+
+        start = time.time()
+        count = 0
+        try:
+            for chunk in chunks(self.parse(stream), batch_size):
+                with transaction.atomic():
+                    self.import_chunk(chunk)
+                count += len(chunk)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if verbosity >= 1:
+            elapsed = time.time() - start
+            self.stdout.write("Imported %d flat pages in %.2f s (%.0f pages/s)."
+                              % (count, elapsed, count / elapsed if elapsed else 0))
+
+    def reset_sequences(self):
+        """
+        Resets primary key sequence of flat pages after pages were created with explicit primary keys.
+        """
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), [FlatPage])
+        if sequence_sql:
+            cursor = connection.cursor()
+            for line in sequence_sql:
+                cursor.execute(line)
+
+    def parse(self, stream):
+        """
+        Yields flat page records from the stream.
+        """
+        page_fields = get_page_fields()
+        translation_fields = get_translation_fields()
+        languages = get_all()
+
+        for lineno, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                record = {'url': data['url'], 'values': self.to_python(data, page_fields)}
+                if self.match == 'id':
+                    record['id'] = FlatPage._meta.pk.to_python(data['id'])
+                if 'sites' in data:
+                    record['sites'] = set(data['sites'])
+                if 'translations' in data:
+                    record['translations'] = {}
+                    for language_code, values in data['translations'].items():
+                        if language_code not in languages:
+                            raise ValueError("Invalid language '%s'" % language_code)
+                        record['translations'][language_code] = self.to_python(values, translation_fields)
+            except (ValueError, TypeError, KeyError, ValidationError) as error:
+                raise CommandError("Invalid flat page on line %d: %r" % (lineno, error))
+            yield record
+
+    def to_python(self, data, fields):
+        """
+        Returns dictionary of field values present in data.
+        """
+        return dict((f.attname, f.to_python(data[f.attname])) for f in fields if f.attname in data)
+
+    def import_chunk(self, chunk):
+        """
+        Stores flat pages from the chunk in constant number of queries except updates of changed pages.
+
+        Changed pages and translations are updated by one query for each distinct value of each changed column.
+        """
+        if self.match == 'id':
+            queryset = FlatPage.objects.filter(pk__in=[record['id'] for record in chunk])
+        else:
+            queryset = FlatPage.objects.filter(url__in=[record['url'] for record in chunk])
+        pages = dict((page.pk, page) for page in queryset)
+        page_sites = defaultdict(dict)
+        if pages:
+            for pk, page_id, site_id in FlatPage.sites.through.objects.filter(flatpage__in=list(pages)) \
+                    .values_list('pk', 'flatpage', 'site'):
+                page_sites[page_id][site_id] = pk
+        urls = defaultdict(list)
+        for page in pages.values():
+            urls[page.url].append(page)
+
+        # Later record wins if the page is duplicate
+        records = SortedDict((self.get_key(record, pages, urls, page_sites), record) for record in chunk)
+        matched = dict((key, pages[key[1]]) for key in records if key[0] == 'pk')
+
+        # Create new pages
+        new_keys = [key for key in records if key[0] != 'pk']
+        if new_keys:
+            new_pages = [FlatPage(pk=records[key].get('id'), **records[key]['values']) for key in new_keys]
+            FlatPage.objects.bulk_create(new_pages)
+            if self.match == 'id':
+                matched.update(zip(new_keys, new_pages))
+                self.reset_sequences()
+            else:
+                # Bulk create does not set primary keys, pages are inserted in order
+                queryset = FlatPage.objects.filter(url__in=set(page.url for page in new_pages)).order_by('pk')
+                if pages:
+                    queryset = queryset.exclude(pk__in=list(pages))
+                created = defaultdict(list)
+                for page in queryset:
+                    created[page.url].append(page)
+                for key in new_keys:
+                    matched[key] = created[key[1]].pop(0)
+
+        # Update changed pages, pages with the same value of a column are updated at once
+        updates = defaultdict(list)
+        for key, record in records.items():
+            page = matched[key]
+            for name, value in record['values'].items():
+                if getattr(page, name) != value:
+                    updates[(name, value)].append(page.pk)
+        for (name, value), pks in updates.items():
+            FlatPage.objects.filter(pk__in=pks).update(**{name: value})
+
+        self.import_translations([(matched[key], record['translations']) for key, record in records.items()
+                                  if 'translations' in record])
+        self.import_sites([(matched[key], record['sites']) for key, record in records.items() if 'sites' in record],
+                          page_sites)
+
+    def get_key(self, record, pages, urls, page_sites):
+        """
+        Returns key which identifies the imported flat page.
+
+        Matched pages are identified by their primary key, new pages by imported id or by URL and sites.
+        """
+        if self.match == 'id':
+            return ('pk' if record['id'] in pages else 'id', record['id'])
+        candidates = urls[record['url']]
+        if 'sites' in record:
+            # Flat page URL is unique only within a site
+            candidates = [page for page in candidates if set(page_sites[page.pk]) & record['sites'] or
+                          not (page_sites[page.pk] or record['sites'])]
+        if len(candidates) > 1:
+            raise CommandError("Flat page URL '%s' matches several flat pages, import it with --match=id."
+                               % record['url'])
+        if candidates:
+            return ('pk', candidates[0].pk)
+        return ('url', record['url'], frozenset(record.get('sites', ())))
+
+    def import_translations(self, items):
+        """
+        Replaces translations of pages with imported ones.
+        """
+        if not items:
+            return
+        translation_model = FlatPage._meta.translation_model
+        existing = dict(((t.master_id, t.language_code), t)
+                        for t in translation_model.objects.filter(master__in=[page.pk for page, data in items]))
+
+        new_translations = []
+        updates = defaultdict(list)
+        for page, translations in items:
+            for language_code, values in translations.items():
+                translation = existing.pop((page.pk, language_code), None)
+                if translation is None:
+                    new_translations.append(translation_model(master_id=page.pk, language_code=language_code,
+                                                              **values))
+                    continue
+                for name, value in values.items():
+                    if getattr(translation, name) != value:
+                        updates[(name, value)].append(translation.pk)
+
+        # Remaining translations are not present in imported data
+        if existing:
+            translation_model.objects.filter(pk__in=[translation.pk for translation in existing.values()]).delete()
+        for (name, value), pks in updates.items():
+            translation_model.objects.filter(pk__in=pks).update(**{name: value})
+        if new_translations:
+            translation_model.objects.bulk_create(new_translations)
+
+    def import_sites(self, items, existing):
+        """
+        Replaces sites of pages with imported ones, `existing` maps page to its sites and their relations.
+        """
+        if not items:
+            return
+        through_model = FlatPage.sites.through
+        removed = []
+        new_relations = []
+        for page, sites in items:
+            current = existing[page.pk]
+            removed.extend(pk for site_id, pk in current.items() if site_id not in sites)
+            new_relations.extend(through_model(flatpage_id=page.pk, site_id=site_id)
+                                 for site_id in sites if site_id not in current)
+
+        if removed:
+            through_model.objects.filter(pk__in=removed).delete()
+        if new_relations:
+            through_model.objects.bulk_create(new_relations)
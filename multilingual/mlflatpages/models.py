@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+from django.conf import settings
 from django.db import models
 from django.contrib.sites.models import Site
 from django.core.urlresolvers import get_script_prefix
@@ -9,6 +10,16 @@ from django.utils.encoding import iri_to_uri, python_2_unicode_compatible
 from multilingual import MultilingualModel, MultilingualManager
 
 
+class FlatPageManager(MultilingualManager):
+    def under_prefix(self, prefix, site_id=None):
+        """
+        Returns flat pages of the site whose URL starts with `prefix`.
+        """
+        if site_id is None:
+            site_id = settings.SITE_ID
+        return self.filter(sites__id=site_id, url__startswith=prefix)
+
+
 @python_2_unicode_compatible
 class FlatPage(MultilingualModel):
     url = models.CharField(_('URL'), max_length=100, db_index=True)
@@ -20,7 +31,7 @@ class FlatPage(MultilingualModel):
         default=False)
     sites = models.ManyToManyField(Site, related_name='mlflatpage_set')
 
-    objects = MultilingualManager()
+    objects = FlatPageManager()
 
     class Translation:
         title = models.CharField(_('title'), max_length=200)
@@ -38,3 +49,4 @@ class FlatPage(MultilingualModel):
     def get_absolute_url(self):
         # Handle script prefix manually because we bypass reverse()
         return iri_to_uri(get_script_prefix().rstrip('/') + self.url)
+
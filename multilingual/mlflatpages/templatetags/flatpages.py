@@ -25,11 +25,12 @@ class FlatpageNode(template.Node):
             site_pk = get_current_site(context['request']).pk
         else:
             site_pk = settings.SITE_ID
-        flatpages = FlatPage.objects.filter(sites__id=site_pk)
-        # If a prefix was specified, add a filter
+        # If a prefix was specified, select only flat pages under it
         if self.starts_with:
-            flatpages = flatpages.filter(
-                url__startswith=self.starts_with.resolve(context))
+            flatpages = FlatPage.objects.under_prefix(
+                self.starts_with.resolve(context), site_pk)
+        else:
+            flatpages = FlatPage.objects.filter(sites__id=site_pk)
 
         # If the provided user is not authenticated, or no user
         # was provided, filter the list to only public flatpages.
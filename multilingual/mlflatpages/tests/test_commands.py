@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+import os
+import tempfile
+from StringIO import StringIO
+
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from multilingual.mlflatpages.models import FlatPage
+
+
+@override_settings(LANGUAGE_CODE='en', LANGUAGES=(('en', 'English'), ('cs', 'Czech'), ('fr', 'French')))
+class FlatpageCommandTests(TestCase):
+    fixtures = ['sample_flatpages', 'example_site']
+
+    def setUp(self):
+        self.filename = tempfile.mktemp()
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def export(self, **options):
+        stdout = StringIO()
+        call_command('export_flatpages', stdout=stdout, stderr=StringIO(), **options)
+        return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    def export_pages(self):
+        # Primary keys of imported pages are not kept unless they are matched by id
+        lines = self.export()
+        for line in lines:
+            del line['id']
+        return lines
+
+    def import_(self, lines, **options):
+        with open(self.filename, 'w') as import_file:
+            for line in lines:
+                import_file.write(json.dumps(line) + '\n')
+        stdout = StringIO()
+        call_command('import_flatpages', self.filename, stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def test_export(self):
+        lines = self.export(batch_size=3)
+        self.assertEqual([line['url'] for line in lines],
+                         ['/flatpage/', '/location/flatpage/', '/sekrit/', '/location/sekrit/'])
+        self.assertEqual(lines[0], {
+            'id': 1, 'url': '/flatpage/', 'template_name': '', 'enable_comments': False, 'registration_required': False,
+            'sites': [1],
+            'translations': {'en': {'title': 'A Flatpage', 'content': "Isn't it flat!"},
+                             'cs': {'title': 'Stránka', 'content': 'Není plochá!'}}})
+
+    def test_roundtrip(self):
+        lines = self.export_pages()
+        FlatPage.objects.all().delete()
+
+        self.import_(lines, batch_size=3)
+        self.assertEqual(self.export_pages(), lines)
+
+    def test_roundtrip_same_url(self):
+        # Flat page URL is unique only within a site
+        Site.objects.create(pk=2, domain='example.org', name='example.org')
+        page = FlatPage.objects.create(url='/flatpage/', title_en='Other site')
+        page.sites.add(2)
+        lines = self.export_pages()
+        FlatPage.objects.all().delete()
+
+        self.import_(lines)
+        self.assertEqual(self.export_pages(), lines)
+        self.assertEqual(FlatPage.objects.filter(url='/flatpage/').count(), 2)
+
+        # Page with URL is matched by its sites
+        self.import_([{'url': '/flatpage/', 'sites': [2], 'enable_comments': True}])
+        self.assertEqual(list(FlatPage.objects.filter(enable_comments=True).values_list('sites', flat=True)), [2])
+        self.assertRaises(CommandError, self.import_, [{'url': '/flatpage/', 'enable_comments': False}])
+
+    def test_roundtrip_id(self):
+        lines = self.export()
+        FlatPage.objects.all().delete()
+
+        self.import_(lines, match='id')
+        self.assertEqual(self.export(), lines)
+        # New pages do not collide with imported primary keys
+        FlatPage.objects.create(url='/new/', title_en='New')
+
+        self.import_([{'id': 1, 'url': '/moved/'}], match='id')
+        self.assertEqual(FlatPage.objects.get(pk=1).url, '/moved/')
+        self.assertRaises(CommandError, self.import_, [{'url': '/moved/'}], match='id')
+
+    def test_import_other_id(self):
+        # Ids from other database are ignored by default
+        self.import_([{'id': 1, 'url': '/about/', 'sites': [1], 'translations': {'en': {'title': 'About'}}},
+                      {'id': 2, 'url': '/flatpage/', 'sites': [1], 'enable_comments': True}])
+        self.assertEqual(FlatPage.objects.get(pk=1).url, '/flatpage/')
+        self.assertTrue(FlatPage.objects.get(pk=1).enable_comments)
+        self.assertEqual(FlatPage.objects.get(url='/about/').title_en, 'About')
+        self.assertEqual(FlatPage.objects.get(pk=2).url, '/location/flatpage/')
+        self.assertEqual(FlatPage.objects.filter(url='/flatpage/').count(), 1)
+
+    def test_import_update(self):
+        Site.objects.create(pk=2, domain='example.org', name='example.org')
+        self.import_([
+            {'url': '/flatpage/', 'enable_comments': True, 'sites': [1, 2],
+             'translations': {'en': {'title': 'Flat', 'content': 'Flatter'}, 'fr': {'title': 'Plat'}}},
+            {'url': '/location/sekrit/', 'registration_required': False},
+        ])
+        self.assertEqual(FlatPage.objects.count(), 4)
+
+        page = FlatPage.objects.get(url='/flatpage/')
+        self.assertTrue(page.enable_comments)
+        self.assertEqual(list(page.sites.values_list('pk', flat=True)), [1, 2])
+        self.assertEqual(page.title_en, 'Flat')
+        self.assertEqual(page.content_en, 'Flatter')
+        translation = FlatPage._meta.translation_model.objects.get(master=page, language_code='fr')
+        self.assertEqual((translation.title, translation.content), ('Plat', ''))
+        self.assertIsNone(page.translation_cs)
+
+        page = FlatPage.objects.get(url='/location/sekrit/')
+        self.assertFalse(page.registration_required)
+        self.assertEqual(list(page.sites.values_list('pk', flat=True)), [1])
+        self.assertEqual(page.title_en, 'Sekrit Nested Flatpage')
+
+    def test_import_unchanged(self):
+        lines = self.export()
+        # Pages, translations and sites are loaded within a savepoint, nothing is written
+        with self.assertNumQueries(5):
+            self.import_(lines)
+
+    def test_import_queries(self):
+        # Number of queries depends only on number of chunks
+        def get_lines(count):
+            return [{'url': '/page/%d/' % i, 'sites': [1], 'translations': {'en': {'title': 'Page %d' % i}}}
+                    for i in range(count)]
+
+        with CaptureQueriesContext(connection) as small:
+            self.import_(get_lines(10), batch_size=100)
+        FlatPage.objects.filter(url__startswith='/page/').delete()
+        with CaptureQueriesContext(connection) as large:
+            self.import_(get_lines(100), batch_size=100)
+        self.assertEqual(len(small), len(large))
+
+    def test_import_batched_update(self):
+        # Pages and translations with the same value of changed column are updated by single query
+        lines = [{'url': '/page/%d/' % i, 'translations': {'en': {'title': 'Page %d' % i}}} for i in range(10)]
+        self.import_(lines)
+        translation_model = FlatPage._meta.translation_model
+        translations = dict(translation_model.objects.filter(master__url__startswith='/page/')
+                            .values_list('pk', 'title'))
+        for line in lines:
+            line['enable_comments'] = True
+            line['translations']['en']['content'] = 'Changed'
+        with CaptureQueriesContext(connection) as captured:
+            self.import_(lines)
+        self.assertEqual(len([q for q in captured if 'UPDATE ' in q['sql']]), 2)
+        self.assertEqual([q for q in captured if 'DELETE ' in q['sql'] or 'INSERT ' in q['sql']], [])
+        self.assertEqual(FlatPage.objects.filter(url__startswith='/page/', enable_comments=True).count(), 10)
+        # Translations are updated in place
+        self.assertEqual(dict(translation_model.objects.filter(master__url__startswith='/page/', content='Changed')
+                              .values_list('pk', 'title')), translations)
+
+    def test_import_throughput(self):
+        lines = [{'url': '/page/%d/' % i, 'sites': [1],
+                  'translations': {'en': {'title': 'Page %d' % i, 'content': 'Content %d' % i},
+                                   'cs': {'title': 'Stránka %d' % i, 'content': 'Obsah %d' % i}}}
+                 for i in range(1000)]
+        output = self.import_(lines)
+        self.assertRegexpMatches(output, r'^Imported 1000 flat pages in [\d.]+ s \(\d+ pages/s\)\.$')
+        self.assertEqual(FlatPage.objects.filter(url__startswith='/page/').count(), 1000)
+        self.assertEqual(FlatPage.objects.get(url='/page/999/').title_cs, 'Stránka 999')
+
+    def test_import_invalid(self):
+        self.assertRaises(CommandError, self.import_, [{'title': 'No URL'}])
+        self.assertRaises(CommandError, self.import_, [{'url': '/de/', 'translations': {'de': {'title': 'Seite'}}}])
+        self.assertRaises(CommandError, call_command, 'import_flatpages', self.filename + '.missing')
@@ -3,7 +3,9 @@
 from __future__ import unicode_literals
 
 from django.core.urlresolvers import set_script_prefix, clear_script_prefix
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
 
 from multilingual.mlflatpages.models import FlatPage
 
@@ -21,3 +23,60 @@ class FlatpageModelTests(TestCase):
             self.assertEqual(pf.get_absolute_url(), '/beverages/tea/')
         finally:
             clear_script_prefix()
+
+
+@override_settings(SITE_ID=1)
+class FlatpageUnderPrefixTests(TestCase):
+    fixtures = ['sample_flatpages', 'example_site']
+
+    def test_under_prefix(self):
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/location/'),
+                                 ['/location/flatpage/', '/location/sekrit/'], lambda f: f.url)
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/'),
+                                 ['/flatpage/', '/location/flatpage/', '/location/sekrit/', '/sekrit/'],
+                                 lambda f: f.url)
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/loc'),
+                                 ['/location/flatpage/', '/location/sekrit/'], lambda f: f.url)
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/location/flatpage/'), ['/location/flatpage/'],
+                                 lambda f: f.url)
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/nowhere/'), [])
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/', site_id=2), [])
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix(''),
+                                 ['/flatpage/', '/location/flatpage/', '/location/sekrit/', '/sekrit/'],
+                                 lambda f: f.url)
+
+    def test_under_prefix_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            list(FlatPage.objects.under_prefix('/location/'))
+        self.assertEqual(len(captured), 1)
+
+    def test_under_prefix_special(self):
+        page = FlatPage.objects.create(url='/location0/', title='Location')
+        page.sites.add(1)
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/location/'),
+                                 ['/location/flatpage/', '/location/sekrit/'], lambda f: f.url)
+        # Wildcards in prefix match only themselves
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/location_'), [])
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('%'), [])
+
+    def test_under_prefix_changes(self):
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/new/'), [])
+
+        page = FlatPage.objects.create(url='/new/page/', title='New page')
+        # Page without site is not listed
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/new/'), [])
+
+        page.sites.add(1)
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/new/'), ['/new/page/'], lambda f: f.url)
+
+        page.url = '/old/page/'
+        page.save()
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/new/'), [])
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/old/'), ['/old/page/'], lambda f: f.url)
+
+        page.sites.clear()
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/old/'), [])
+
+        page.sites.add(1)
+        page.delete()
+        self.assertQuerysetEqual(FlatPage.objects.under_prefix('/old/'), [])
@@ -1,11 +1,16 @@
 import os
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser, User
 from django.contrib.auth.tests.utils import skipIfCustomUser
 from django.template import Template, Context, TemplateSyntaxError
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.test.utils import override_settings
 from django.utils.translation import activate, deactivate_all
 
+from multilingual.alternates import get_alternate_urls
+from multilingual.mlflatpages.models import FlatPage
+from multilingual.rendering import prefetch_translations
+
 
 def setUpModule():
     activate('en')
@@ -141,3 +146,39 @@ class FlatpageTemplateTagTests(TestCase):
                           "{% load flatpages %}{% get_flatpages for user as flatpages asdf%}")
         self.assertRaises(TemplateSyntaxError, render,
                           "{% load flatpages %}{% get_flatpages prefix for user as flatpages asdf%}")
+
+
+@override_settings(SITE_ID=1)
+class FlatpageAlternatesTemplateTagTests(TestCase):
+    fixtures = ['sample_flatpages']
+
+    def test_ml_alternates_tag(self):
+        "The alternates template tag returns URLs of translations of the flatpage"
+        template = Template(
+            "{% load multiling %}"
+            "{% ml_alternates flatpage as alternates %}"
+            "{% for alternate in alternates %}"
+            "{{ alternate.language_code }}:{{ alternate.name }}:{{ alternate.url }},"
+            "{% endfor %}"
+        )
+        flatpage = FlatPage.objects.get(url='/flatpage/')
+        # Translations are checked by single query and cached
+        with self.assertNumQueries(1):
+            out = template.render(Context({'flatpage': flatpage}))
+            self.assertEqual(out, template.render(Context({'flatpage': flatpage})))
+        self.assertEqual(out, "cs:%s:/flatpage/,en:English:/flatpage/," % dict(settings.LANGUAGES)['cs'])
+
+        request = RequestFactory().get('/flatpage/')
+        out = Template(
+            "{% load multiling %}"
+            "{% ml_alternates flatpage as alternates %}"
+            "{% for alternate in alternates %}{{ alternate.url }},{% endfor %}"
+        ).render(Context({'flatpage': flatpage, 'request': request}))
+        self.assertEqual(out, "http://testserver/flatpage/,http://testserver/flatpage/,")
+
+    def test_ml_alternates_prefetched(self):
+        "The alternates template tag uses loaded translations"
+        flatpage = prefetch_translations(FlatPage.objects.filter(url='/flatpage/')).get()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_alternate_urls(flatpage).keys(), ['cs', 'en'])
+        self.assertEqual(get_alternate_urls(flatpage, ['fr', 'en']).keys(), ['en'])
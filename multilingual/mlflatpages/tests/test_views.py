@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 import os
 from django.conf import settings
 from django.contrib.auth.models import User
@@ -136,3 +137,75 @@ class FlatpageViewAppendSlashTests(TestCase):
 
         response = self.client.get('/flatpage_root/some.very_special~chars-here')
         self.assertRedirects(response, '/flatpage_root/some.very_special~chars-here/', status_code=301)
+
+
+@override_settings(
+    LOGIN_URL='/accounts/login/',
+    MIDDLEWARE_CLASSES=(
+        'django.middleware.common.CommonMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.locale.LocaleMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    ),
+    TEMPLATE_DIRS=(
+        os.path.join(os.path.dirname(__file__), 'templates'),
+    ),
+    SITE_ID=1,
+)
+class FlatpageViewCacheHeadersTests(TestCase):
+    fixtures = ['sample_flatpages', 'example_site']
+    urls = 'multilingual.mlflatpages.tests.urls'
+
+    def tearDown(self):
+        activate('en')
+
+    def test_vary_language(self):
+        "A flatpage response varies on headers which determine the language"
+        response = self.client.get('/flatpage_root/flatpage/', HTTP_ACCEPT_LANGUAGE='cs')
+        self.assertContains(response, u"<p>Není plochá!</p>")
+        self.assertIn('Accept-Language', response['Vary'])
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_etag(self):
+        "A flatpage response has ETag which depends on language"
+        response_en = self.client.get('/flatpage_root/flatpage/', HTTP_ACCEPT_LANGUAGE='en')
+        response_cs = self.client.get('/flatpage_root/flatpage/', HTTP_ACCEPT_LANGUAGE='cs')
+        self.assertTrue(response_en.has_header('ETag'))
+        self.assertTrue(response_cs.has_header('ETag'))
+        self.assertNotEqual(response_en['ETag'], response_cs['ETag'])
+
+        response = self.client.get('/flatpage_root/flatpage/', HTTP_ACCEPT_LANGUAGE='en',
+                                   HTTP_IF_NONE_MATCH=response_en['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], response_en['ETag'])
+        self.assertIn('Accept-Language', response['Vary'])
+
+        response = self.client.get('/flatpage_root/flatpage/', HTTP_ACCEPT_LANGUAGE='cs',
+                                   HTTP_IF_NONE_MATCH=response_en['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changed(self):
+        "ETag of a flatpage changes when its translation changes"
+        response = self.client.get('/flatpage_root/flatpage/', HTTP_ACCEPT_LANGUAGE='en')
+        page = FlatPage.objects.get(url='/flatpage/')
+        page.content_en = "Isn't it flatter!"
+        page.save()
+
+        response = self.client.get('/flatpage_root/flatpage/', HTTP_ACCEPT_LANGUAGE='en',
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<p>Isn't it flatter!</p>")
+
+    @skipIfCustomUser
+    def test_etag_authentication(self):
+        "A matching ETag does not bypass the authentication"
+        User.objects.create_user('testuser', 'test@example.com', 's3krit')
+        self.client.login(username='testuser', password='s3krit')
+        response = self.client.get('/flatpage_root/sekrit/')
+        self.assertIn('Cookie', response['Vary'])
+        self.client.logout()
+
+        response = self.client.get('/flatpage_root/sekrit/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertRedirects(response, '/accounts/login/?next=/flatpage_root/sekrit/')
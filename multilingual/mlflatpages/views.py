@@ -1,11 +1,46 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib.flatpages.views import render_flatpage
 from django.contrib.sites.models import get_current_site
-from django.http import Http404, HttpResponsePermanentRedirect
+from django.http import Http404, HttpResponseNotModified, HttpResponsePermanentRedirect
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from django.utils.encoding import force_bytes
+from django.utils.http import parse_etags, quote_etag
+
+from multilingual.languages import get_active, is_locked
 
 from .models import FlatPage
 
+
+def get_etag(f):
+    """
+    Returns ETag of the flat page computed from the page and its translation for active language.
+
+    Changes in templates are not reflected.
+    """
+    values = [f.pk, f.url, f.template_name, f.enable_comments, f.registration_required, get_active()]
+    translation = f.translation
+    if translation is not None:
+        values.extend((translation.pk, translation.title, translation.content))
+    return hashlib.md5(force_bytes(repr(values))).hexdigest()
+
+
+def get_vary_headers(request, f):
+    """
+    Returns headers the flat page response depends on.
+    """
+    headers = []
+    # Language is taken from request if it was determined by LocaleMiddleware and it is not locked.
+    if not is_locked() and hasattr(request, 'LANGUAGE_CODE'):
+        headers.append('Accept-Language')
+    # Language in cookie or session as well as user's authentication
+    if headers or f.registration_required:
+        headers.append('Cookie')
+    return headers
+
+
 # This view is called from FlatpageFallbackMiddleware.process_response
 # when a 404 is raised, which often means CsrfViewMiddleware.process_view
 # has not been called even if CsrfViewMiddleware is installed. So we need
@@ -29,7 +64,7 @@ def flatpage(request, url):
         url = '/' + url
     site_id = get_current_site(request).id
     try:
-        f = get_object_or_404(FlatPage,
+        f = get_object_or_404(FlatPage.objects.select_related('translation'),
             url__exact=url, sites__id__exact=site_id)
     except Http404:
         if not url.endswith('/') and settings.APPEND_SLASH:
@@ -40,5 +75,17 @@ def flatpage(request, url):
         else:
             raise
 
-    # Use django flatpage render
-    return render_flatpage(request, f)
+    etag = get_etag(f)
+    # Do not skip the authentication check in `render_flatpage`.
+    login_required = f.registration_required and not request.user.is_authenticated()
+    if request.method in ('GET', 'HEAD') and not login_required \
+            and etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+    else:
+        # Use django flatpage render
+        response = render_flatpage(request, f)
+
+    if response.status_code in (200, 304):
+        response['ETag'] = quote_etag(etag)
+    patch_vary_headers(response, get_vary_headers(request, f))
+    return response
@@ -8,7 +8,7 @@ from django.db.models.base import ModelBase
 
 from multilingual.languages import get_all
 
-from .fields import TranslationProxyField, TranslationRelation, TRANSLATION_FIELD_NAME
+from .fields import TranslationProxyField, TranslationRelation, TRANSLATION_CHANGED_ATTR, TRANSLATION_FIELD_NAME
 from .manager import MultilingualManager
 from .options import MultilingualOptions
 from .translation import TranslationModelBase, TranslationModel
@@ -18,6 +18,13 @@ from .translation import TranslationModelBase, TranslationModel
 
 class MultilingualModelBase(ModelBase):
     def __new__(cls, name, bases, attrs):
+        meta = attrs.get('Meta', None)
+        if getattr(meta, 'proxy', False):
+            # Proxy models, e.g. models for deferred loading, share translations with their concrete model
+            new_class = super(MultilingualModelBase, cls).__new__(cls, name, bases, attrs)
+            new_class._meta.translation_model = new_class._meta.concrete_model._meta.translation_model
+            return new_class
+
         ### START - Build translation model
         # At first we build translation model so we can add it to attrs
         # Purpose is to not call 'add_to_class' after model is registered
@@ -94,6 +101,7 @@ class MultilingualModel(models.Model):
         Change save method to save translations when multilingual object is saved.
         """
         super(MultilingualModel, self).save(force_insert=force_insert, force_update=force_update, using=using)
+        saved = set()
         for field in self._meta.fields:
             if not isinstance(field, TranslationRelation):
                 continue
@@ -101,11 +109,18 @@ class MultilingualModel(models.Model):
             # Find translation. Use cache name to prevent any unnecessary SQL queries.
             # If it isn't loaded, it isn't changed.
             attr_name = field.get_cache_name()
+            if attr_name in saved:
+                # Relation for active language shares the cache with relation for that language
+                continue
+            saved.add(attr_name)
             translation = getattr(self, attr_name, None)
 
             if translation is None:
                 # Translation does not exist, continue with next
                 continue
+            if not translation.__dict__.pop(TRANSLATION_CHANGED_ATTR, True):
+                # Translation is known to be unchanged
+                continue
 
             # Set the master ID. The master and translation could be just created.
             translation.master_id = self.pk
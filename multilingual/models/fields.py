@@ -12,6 +12,14 @@ from multilingual.utils import sanitize_language_code
 
 
 TRANSLATION_FIELD_NAME = 'translation'
+# Instance attribute with names of translation fields to be loaded, if deferred loading is used
+TRANSLATION_LOADED_FIELDS_ATTR = '_translation_loaded_fields'
+# Instance attribute with language bound by `MultilingualQuerySet.language()`
+BOUND_LANGUAGE_ATTR = '_bound_language_code'
+# Instance attribute with cached codes of translated languages, see `prefetch_translated_languages`
+TRANSLATED_LANGUAGES_ATTR = '_translated_languages'
+# Translation attribute which tells whether proxy fields changed the translation, translations without it are saved
+TRANSLATION_CHANGED_ATTR = '_translation_changed'
 
 
 class TranslationRel(OneToOneRel):
@@ -43,7 +51,27 @@ class TranslationDescriptor(ReverseSingleRelatedObjectDescriptor):
     def cache_name(self):
         return self.field.get_cache_name()
 
+    def _get_bound_name(self, instance):
+        # Returns name of relation for the language bound to the instance, if this is relation for active language
+        language_code = getattr(instance, BOUND_LANGUAGE_ATTR, None)
+        if language_code is None or self.field._language_code is not None:
+            return None
+        return '%s_%s' % (self.field._base_name, sanitize_language_code(language_code))
+
+    def get_queryset(self, **db_hints):
+        queryset = super(TranslationDescriptor, self).get_queryset(**db_hints)
+        # Prefetch does not use extra descriptor filter
+        queryset = queryset.filter(language_code=self.field.language_code)
+        # Respect `only()` and `defer()` of the query which loaded the instance
+        fields = getattr(db_hints.get('instance'), TRANSLATION_LOADED_FIELDS_ATTR, None)
+        if fields is not None:
+            queryset = queryset.only(*fields)
+        return queryset
+
     def __get__(self, instance, instance_type=None):
+        bound_name = self._get_bound_name(instance)
+        if bound_name is not None:
+            return getattr(instance, bound_name)
         try:
             return super(TranslationDescriptor, self).__get__(instance, instance_type)
         except self.field.rel.to.DoesNotExist:
@@ -55,6 +83,13 @@ class TranslationDescriptor(ReverseSingleRelatedObjectDescriptor):
             # seems to be better option that complete override of this method.
             return None
 
+    def __set__(self, instance, value):
+        bound_name = self._get_bound_name(instance)
+        if bound_name is not None:
+            setattr(instance, bound_name, value)
+        else:
+            super(TranslationDescriptor, self).__set__(instance, value)
+
 
 # Based on 'django.contrib.contenttypes.generic.GenericRelation' and
 # 'django.tests.foreign_object.models.ActiveTranslationField'
@@ -168,14 +203,65 @@ class TranslationProxyField(property):
         """
         return self._field_name
 
+    @property
+    def admin_order_field(self):
+        """
+        Enables ordering by the field in admin changelist.
+        """
+        return self.name
+
+    @property
+    def short_description(self):
+        """
+        Returns label of the field for admin changelist.
+        """
+        return self.model._meta.translation_model._meta.get_field(self._field_name).verbose_name
+
     @property
     def language_code(self):
         """
         Returns effective language code.
         """
+        return self.get_language_code()
+
+    @property
+    def uses_active_language(self):
+        """
+        Returns whether the field is translated to active language rather than a fixed one.
+        """
+        return self._language_code is None
+
+    def get_language_code(self, active_language=None):
+        """
+        Returns effective language code, `active_language` is used instead of active language if provided.
+        """
         if self._language_code is not None:
             return self._language_code
-        return get_active()
+        return active_language or get_active()
+
+    @property
+    def fallback(self):
+        """
+        Returns whether field uses fallback languages.
+        """
+        return self._fallback
+
+    @property
+    def language_codes(self):
+        """
+        Returns list of language codes to be tried in order of precedence.
+        """
+        return self.get_language_codes()
+
+    def get_language_codes(self, active_language=None):
+        """
+        Returns list of language codes to be tried in order of precedence for `active_language`.
+        """
+        language_code = self.get_language_code(active_language)
+        lang_codes = [language_code]
+        if self._fallback:
+            lang_codes += get_fallbacks(language_code)
+        return lang_codes
 
     def __get__(self, instance, instance_type=None):
         """
@@ -186,12 +272,7 @@ class TranslationProxyField(property):
 
         translation_model = self.model._meta.translation_model
 
-        # Find language codes to be tried
-        lang_codes = [self.language_code]
-        if self._fallback:
-            lang_codes += get_fallbacks(self.language_code)
-
-        for lang_code in lang_codes:
+        for lang_code in self.get_language_codes(getattr(instance, BOUND_LANGUAGE_ATTR, None)):
             # Find translation
             translation_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(lang_code))
             try:
@@ -216,7 +297,8 @@ class TranslationProxyField(property):
         translation_model = self.model._meta.translation_model
 
         # Find translation
-        translation_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(self.language_code))
+        language_code = self.get_language_code(getattr(instance, BOUND_LANGUAGE_ATTR, None))
+        translation_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(language_code))
 
         try:
             # Translation is nullable, so it may return None
@@ -226,8 +308,9 @@ class TranslationProxyField(property):
 
         if translation is None:
             # Translation does not exist, create one
-            translation = translation_model(master=instance, language_code=self.language_code)
+            translation = translation_model(master=instance, language_code=language_code)
             setattr(instance, translation_name, translation)
 
         # Set the field translation
         setattr(translation, self._field_name, value)
+        setattr(translation, TRANSLATION_CHANGED_ATTR, True)
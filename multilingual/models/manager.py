@@ -15,3 +15,18 @@ class MultilingualManager(Manager):
     # and additionaly filter or order querysets returned by that manager.
     def get_queryset(self):
         return MultilingualQuerySet(self.model)
+
+    def language(self, language_code):
+        return self.get_queryset().language(language_code)
+
+    def has_translation(self, language_code=None):
+        return self.get_queryset().has_translation(language_code)
+
+    def missing_translation(self, language_code=None):
+        return self.get_queryset().missing_translation(language_code)
+
+    def filter_any_language(self, language_codes=None, **lookups):
+        return self.get_queryset().filter_any_language(language_codes, **lookups)
+
+    def translation_coverage(self):
+        return self.get_queryset().translation_coverage()
@@ -1,9 +1,31 @@
 """
 Queryset for multilingual models
 """
+from django.db.models import Count
 from django.db.models.query import QuerySet
+from django.utils.datastructures import SortedDict
 
+from multilingual.languages import get_active, get_all, is_valid
+
+from .fields import BOUND_LANGUAGE_ATTR, TRANSLATED_LANGUAGES_ATTR, TRANSLATION_LOADED_FIELDS_ATTR
 from .sql.query import MultilingualQuery
+from .utils import expand_lookup, get_translation_subquery
+
+
+def prefetch_translated_languages(objects):
+    """
+    Caches languages the multilingual objects are translated to, they are loaded for all objects by single query.
+    """
+    objects = [obj for obj in objects if obj.pk is not None]
+    if not objects:
+        return
+    translation_model = objects[0]._meta.translation_model
+    translated = dict((obj.pk, set()) for obj in objects)
+    for master, language_code in translation_model._default_manager.filter(master__in=translated.keys()) \
+            .values_list('master', 'language_code'):
+        translated[master].add(language_code)
+    for obj in objects:
+        setattr(obj, TRANSLATED_LANGUAGES_ATTR, translated[obj.pk])
 
 
 class MultilingualQuerySet(QuerySet):
@@ -14,3 +36,88 @@ class MultilingualQuerySet(QuerySet):
     def __init__(self, model=None, query=None, using=None):
         query = query or MultilingualQuery(model)
         super(MultilingualQuerySet, self).__init__(model, query, using)
+
+    def iterator(self):
+        # Pass fields of translations selected by `only()` and `defer()` to instances for lazy loaded translations.
+        translation_fields = self.query.get_translation_loaded_fields()
+        language_code = self.query.language_code
+        for obj in super(MultilingualQuerySet, self).iterator():
+            if translation_fields is not None:
+                setattr(obj, TRANSLATION_LOADED_FIELDS_ATTR, translation_fields)
+            if language_code is not None:
+                setattr(obj, BOUND_LANGUAGE_ATTR, language_code)
+            yield obj
+
+    def language(self, language_code):
+        """
+        Returns queryset which uses the language instead of active language.
+
+        The language is used by lookups on multilingual fields and by instances returned by the queryset, so it does
+        not depend on language locks or active language of the thread. It has to be set before lookups which use
+        active language, e.g. `filter(title=...)`.
+        """
+        if not is_valid(language_code):
+            raise ValueError("Invalid language '%s'" % language_code)
+        if self.query.active_language_used:
+            raise ValueError("Language can not be set after lookups in active language, call language() first.")
+        clone = self._clone()
+        clone.query.language_code = language_code
+        return clone
+
+    def prefetch_related(self, *lookups):
+        if lookups == (None, ):
+            return super(MultilingualQuerySet, self).prefetch_related(*lookups)
+        opts = self.model._meta
+        clone = super(MultilingualQuerySet, self).prefetch_related(
+            *[expand_lookup(opts, lookup, self.query.language_code) for lookup in lookups])
+        for lookup in lookups:
+            clone.query.note_lookup(opts, lookup)
+        return clone
+
+    def _filter_translated(self, language_code, negate=False):
+        # Returns objects (not) translated to the language
+        clone = self._clone()
+        if language_code is None:
+            if clone.query.language_code is None:
+                clone.query.active_language_used = True
+            language_code = clone.query.language_code or get_active()
+        subquery = get_translation_subquery(self.model, [language_code]).using(self.db)
+        if negate:
+            return clone.exclude(pk__in=subquery)
+        return clone.filter(pk__in=subquery)
+
+    def has_translation(self, language_code=None):
+        """
+        Returns objects which have translation for the language, active language by default.
+        """
+        return self._filter_translated(language_code)
+
+    def missing_translation(self, language_code=None):
+        """
+        Returns objects which have no translation for the language, active language by default.
+        """
+        return self._filter_translated(language_code, negate=True)
+
+    def filter_any_language(self, language_codes=None, **lookups):
+        """
+        Returns objects which have a translation matching all lookups in any of the languages, all languages by default.
+
+        Lookups are applied on translation fields, e.g. `filter_any_language(title__icontains='word')`. The filter is
+        a single subquery on translation table, so it neither joins translation for each language nor returns
+        duplicate objects.
+        """
+        return self.filter(pk__in=get_translation_subquery(self.model, language_codes, **lookups).using(self.db))
+
+    def translation_coverage(self):
+        """
+        Returns dictionary with number of objects translated to each language.
+
+        Counts are computed by single aggregate query over translation table.
+        """
+        translation_model = self.model._meta.translation_model
+        counts = translation_model._default_manager.using(self.db) \
+            .filter(master__in=self.order_by().values('pk')) \
+            .values_list('language_code').annotate(Count('pk')).order_by()
+        coverage = SortedDict((language_code, 0) for language_code in get_all())
+        coverage.update(dict(counts))
+        return coverage
@@ -0,0 +1,28 @@
+"""
+Query expressions for multilingual queries
+"""
+from django.db.models.expressions import F
+from django.db.models.sql.expressions import SQLEvaluator
+
+from multilingual.models.utils import expand_fallback_lookup, expand_lookup
+
+from .where import FallbackColumns
+
+
+class MultilingualSQLEvaluator(SQLEvaluator):
+    """
+    SQL evaluator which handles multilingual fields in `F()` expressions.
+    """
+    def prepare_leaf(self, node, query, allow_joins):
+        opts = query.get_meta()
+        query.note_lookup(opts, node.name)
+        lookups = expand_fallback_lookup(opts, node.name, query.language_code)
+        if node.name not in query.aggregates and lookups is not None and len(lookups) > 1:
+            field, columns = query.setup_fallback_joins(lookups)
+            self.cols.append((node, FallbackColumns(columns)))
+            return
+
+        expanded = F(expand_lookup(opts, node.name, query.language_code))
+        super(MultilingualSQLEvaluator, self).prepare_leaf(expanded, query, allow_joins)
+        # Columns are looked up by the original node
+        self.cols = [(node if n is expanded else n, col) for n, col in self.cols]
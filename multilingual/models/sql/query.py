@@ -1,26 +1,110 @@
 """
 Query for multilingual models
 """
+import copy
 import warnings
 
+from django.core.exceptions import FieldError
 from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import ExpressionNode
 from django.db.models.sql.query import get_order_dir, Query
+from django.db.models.sql.where import AND
+from django.utils.datastructures import SortedDict
 
 from multilingual.models.fields import TRANSLATION_FIELD_NAME
-from multilingual.models.utils import expand_lookup
-from multilingual.languages import get_all, get_active
+from multilingual.models.utils import _get_proxy_or_none, expand_fallback_lookup, expand_lookup, \
+    get_translation_subquery
+from multilingual.languages import get_active, is_valid, ANY_LANGUAGE_LOOKUP
 from multilingual.utils import sanitize_language_code
 
+from .expressions import MultilingualSQLEvaluator
+from .where import FallbackColumns, FallbackConstraint
+
 
 __all__ = ['MultilingualQuery']
 
 
+# Prefix of names of columns selected for ordering by fallback fields
+FALLBACK_COLUMN_PREFIX = 'ml_fallback_'
+
+
 class MultilingualQuery(Query):
     """
     Query for multilingual models
 
     For proper function we need to take care of JOINs between multilingual and translation tables.
     """
+    def __init__(self, model, *args, **kwargs):
+        super(MultilingualQuery, self).__init__(model, *args, **kwargs)
+        # Fallback fields used in ordering, maps column name to lookups of the field
+        self.fallback_ordering = {}
+        # Language used instead of active language, see `MultilingualQuerySet.language()`
+        self.language_code = None
+        # Whether lookups were expanded for active language
+        self.active_language_used = False
+
+    def clone(self, klass=None, memo=None, **kwargs):
+        obj = super(MultilingualQuery, self).clone(klass=klass, memo=memo, **kwargs)
+        if isinstance(obj, MultilingualQuery):
+            obj.fallback_ordering = self.fallback_ordering.copy()
+            obj.language_code = self.language_code
+            obj.active_language_used = self.active_language_used
+        else:
+            # Other queries do not know fallback columns
+            obj.order_by = [o for o in obj.order_by if get_order_dir(o)[0] not in self.fallback_ordering]
+        return obj
+
+    @property
+    def extra_select(self):
+        """
+        Returns extra select without fallback columns, they are selected only for ordering.
+        """
+        extra_select = super(MultilingualQuery, self).extra_select
+        if not self.fallback_ordering:
+            return extra_select
+        return SortedDict((k, v) for k, v in extra_select.items() if k not in self.fallback_ordering)
+
+    def get_compiler(self, using=None, connection=None):
+        names = []
+        if not self.extra_order_by:
+            names = [get_order_dir(o)[0] for o in self.order_by if get_order_dir(o)[0] in self.fallback_ordering]
+        if not names:
+            return super(MultilingualQuery, self).get_compiler(using=using, connection=connection)
+
+        # Fallback columns are set up only for the final ordering and on a copy, so the query is not changed.
+        # Quoting depends on the connection, so they are rendered just before compilation.
+        obj = self.clone()
+        compiler = super(MultilingualQuery, obj).get_compiler(using=using, connection=connection)
+        for name in names:
+            field, columns = obj.setup_fallback_joins(self.fallback_ordering[name])
+            obj.extra[name] = FallbackColumns(columns).as_sql(compiler.quote_name_unless_alias, compiler.connection)
+        return compiler
+
+    def note_lookup(self, opts, lookup):
+        """
+        Remembers whether the lookup is expanded for active language, so the language can not change later.
+        """
+        if self.language_code is None:
+            field_name = lookup.split(LOOKUP_SEP)[0]
+            field = _get_proxy_or_none(opts, field_name)
+            if field_name == TRANSLATION_FIELD_NAME or field is not None and field.uses_active_language:
+                self.active_language_used = True
+
+    def setup_fallback_joins(self, lookups):
+        """
+        Sets up joins for lookups of fallback field. Returns the translated field and list of (alias, column) pairs.
+
+        Translations are joined by LEFT OUTER JOINs, so objects with missing translations are kept.
+        """
+        columns = []
+        for lookup in lookups:
+            field, targets, opts, joins, path = self.setup_joins(lookup.split(LOOKUP_SEP), self.get_meta(),
+                                                                 self.get_initial_alias())
+            # Promote only joins created here, other joins are used by filters.
+            self.promote_joins([alias for alias in joins[1:] if self.alias_refcount[alias] < 2])
+            columns.append((joins[-1], targets[0].column))
+        return field, columns
+
     def build_filter(self, filter_expr, branch_negated=False, current_negated=False,
                      can_reuse=None):
         """
@@ -30,22 +114,130 @@ class MultilingualQuery(Query):
         parts = arg.split(LOOKUP_SEP)
 
         field_name = parts[0]
-        new_name = expand_lookup(self.get_meta(), field_name)
-        filter_expr = LOOKUP_SEP.join([new_name] + parts[1:]), value
+        if len(parts) > 1 and parts[1] == ANY_LANGUAGE_LOOKUP:
+            filter_expr = self.build_any_language_filter(field_name, parts[2:], value)
+            return super(MultilingualQuery, self).build_filter(filter_expr, branch_negated=branch_negated,
+                                                               current_negated=current_negated, can_reuse=can_reuse)
+
+        self.note_lookup(self.get_meta(), arg)
+        lookups = expand_fallback_lookup(self.get_meta(), field_name, self.language_code)
+        if lookups is not None and len(lookups) > 1:
+            return self.build_fallback_filter(lookups, parts[1:], value, current_negated=current_negated)
+
+        if isinstance(value, ExpressionNode):
+            value = MultilingualSQLEvaluator(value, self, reuse=can_reuse)
+        filter_expr = expand_lookup(self.get_meta(), arg, self.language_code), value
 
         return super(MultilingualQuery, self).build_filter(filter_expr, branch_negated=branch_negated,
                                                            current_negated=current_negated, can_reuse=can_reuse)
 
+    def build_any_language_filter(self, field_name, lookup_parts, value):
+        """
+        Returns filter expression which matches objects with translation of field in any language.
+        """
+        field = _get_proxy_or_none(self.get_meta(), field_name)
+        # Only the field for active language, e.g. 'title', supports the lookup
+        if field is None or field.name != field.field_name:
+            raise FieldError("Lookup '%s' is not supported for field %r." % (ANY_LANGUAGE_LOOKUP, field_name))
+        lookup = LOOKUP_SEP.join([field.field_name] + lookup_parts)
+        # Query is compiled as a subquery by the connection of this query, unlike queryset which keeps its database
+        return 'pk__in', get_translation_subquery(self.model, **{lookup: value}).query
+
+    def build_fallback_filter(self, lookups, lookup_parts, value, current_negated=False):
+        """
+        Builds filter on the first existing translation from lookups of fallback field.
+        """
+        if len(lookup_parts) > 1 or lookup_parts and lookup_parts[0] not in self.query_terms:
+            raise FieldError("Cannot resolve keyword %r into field." % LOOKUP_SEP.join(lookup_parts))
+        lookup_type = lookup_parts[0] if lookup_parts else 'exact'
+
+        # Handle value in the same way as `Query.build_filter`
+        if value is None:
+            if lookup_type != 'exact':
+                raise ValueError("Cannot use None as a query value")
+            lookup_type = 'isnull'
+            value = True
+        elif callable(value):
+            value = value()
+        elif isinstance(value, ExpressionNode):
+            value = MultilingualSQLEvaluator(value, self)
+
+        field, columns = self.setup_fallback_joins(lookups)
+        clause = self.where_class()
+        clause.add((FallbackConstraint(columns, field), lookup_type, value), AND)
+        if current_negated and lookup_type != 'isnull':
+            # Exclude NULL values in the same way as `Query.build_filter`
+            clause.add((FallbackConstraint(columns, None), 'isnull', False), AND)
+        return clause
+
+    def add_aggregate(self, aggregate, model, alias, is_summary):
+        """
+        Adds aggregate with respect to the multilingual fields.
+        """
+        opts = model._meta
+        self.note_lookup(opts, aggregate.lookup)
+        lookups = expand_fallback_lookup(opts, aggregate.lookup, self.language_code)
+        if aggregate.lookup not in self.aggregates and lookups is not None and len(lookups) > 1:
+            field, columns = self.setup_fallback_joins(lookups)
+            aggregate.add_to_query(self, alias, col=FallbackColumns(columns), source=field, is_summary=is_summary)
+            return
+
+        # Do not change the aggregate, it may be used in other queries
+        aggregate = copy.copy(aggregate)
+        aggregate.lookup = expand_lookup(opts, aggregate.lookup, self.language_code)
+        return super(MultilingualQuery, self).add_aggregate(aggregate, model, alias, is_summary)
+
+    def expand_loading_names(self, field_names):
+        """
+        Expands field names for `defer()` and `only()`, fallback fields are expanded to all their languages.
+        """
+        opts = self.get_meta()
+        new_field_names = []
+        for field_name in field_names:
+            self.note_lookup(opts, field_name)
+            lookups = expand_fallback_lookup(opts, field_name, self.language_code)
+            if lookups is not None:
+                new_field_names.extend(lookups)
+            else:
+                new_field_names.append(expand_lookup(opts, field_name, self.language_code))
+        return new_field_names
+
+    def add_deferred_loading(self, field_names):
+        return super(MultilingualQuery, self).add_deferred_loading(self.expand_loading_names(field_names))
+
+    def add_immediate_loading(self, field_names):
+        return super(MultilingualQuery, self).add_immediate_loading(self.expand_loading_names(field_names))
+
+    def get_translation_loaded_fields(self):
+        """
+        Returns names of translation fields to be loaded or None if all fields are loaded.
+        """
+        translation_model = self.get_meta().translation_model
+        fields = self.get_loaded_field_names().get(translation_model)
+        if fields is None:
+            return None
+        # Language and master are always loaded, so translations can be saved
+        return fields | set(('language_code', 'master'))
+
     def add_fields(self, field_names, allow_m2m=True):
         opts = self.get_meta()
-        new_field_names = [expand_lookup(opts, f) for f in field_names]
+        for field_name in field_names:
+            self.note_lookup(opts, field_name)
+        new_field_names = [expand_lookup(opts, f, self.language_code) for f in field_names]
         return super(MultilingualQuery, self).add_fields(new_field_names, allow_m2m=allow_m2m)
 
     def add_ordering(self, *ordering):
         new_ordering = []
         for order in ordering:
             field_name, dirn = get_order_dir(order)
-            new_name = expand_lookup(self.get_meta(), field_name)
+            self.note_lookup(self.get_meta(), field_name)
+            lookups = expand_fallback_lookup(self.get_meta(), field_name, self.language_code)
+            if lookups is not None and len(lookups) > 1:
+                # Column with the first non-null value of lookups is set up when the query is compiled
+                new_name = FALLBACK_COLUMN_PREFIX + field_name
+                self.fallback_ordering[new_name] = lookups
+            else:
+                new_name = expand_lookup(self.get_meta(), field_name, self.language_code)
             if dirn == 'DESC':
                 new_name = '-%s' % new_name
             new_ordering.append(new_name)
@@ -66,21 +258,23 @@ class MultilingualQuery(Query):
                 new_name = None
 
                 if field_name == 'translations':
-                    new_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(get_active()))
+                    self.active_language_used = self.active_language_used or self.language_code is None
+                    language_code = self.language_code or get_active()
+                    new_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(language_code))
                 elif '_' in field_name:
                     dummy, language_code = field_name.rsplit('_', 1)
-                    if language_code in get_all():
+                    if is_valid(language_code):
                         new_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(language_code))
 
                 if new_name:
                     msg = "Using '%s' in select_related is deprecated, use '%s' or '%s' instead."
                     warnings.warn(msg % (field_name, TRANSLATION_FIELD_NAME, new_name), DeprecationWarning)
-                    new_fields.append(TRANSLATION_FIELD_NAME)
                     new_fields.append(new_name)
                     continue
 
-            # In all other cases use the old name
-            new_fields.append(field_name)
+            # In all other cases use the old name, translation for active language shares join with its language
+            self.note_lookup(opts, field_name)
+            new_fields.append(expand_lookup(opts, field_name, self.language_code))
 
         new_fields = set(new_fields)
         return super(MultilingualQuery, self).add_select_related(new_fields)
@@ -0,0 +1,44 @@
+"""
+Where constraints for multilingual queries
+"""
+from django.db.models.sql.where import Constraint
+
+
+class FallbackColumns(object):
+    """
+    SQL expression for the first non-null value of the columns.
+
+    Columns are (alias, column) pairs in order of precedence.
+    """
+    def __init__(self, columns, db_type=None, internal_type=None):
+        self.columns = columns
+        self.db_type = db_type
+        self.internal_type = internal_type
+
+    def as_sql(self, qn, connection):
+        qn2 = connection.ops.quote_name
+        sql = 'COALESCE(%s)' % ', '.join('%s.%s' % (qn(alias), qn2(column)) for alias, column in self.columns)
+        return connection.ops.field_cast_sql(self.db_type, self.internal_type) % sql, []
+
+    def relabeled_clone(self, change_map):
+        columns = [(change_map.get(alias, alias), column) for alias, column in self.columns]
+        return self.__class__(columns, self.db_type, self.internal_type)
+
+
+class FallbackConstraint(Constraint):
+    """
+    Constraint on the first non-null value of the columns.
+    """
+    def __init__(self, columns, field):
+        alias, col = columns[0]
+        super(FallbackConstraint, self).__init__(alias, col, field)
+        self.columns = columns
+
+    def process(self, lookup_type, value, connection):
+        (alias, col, db_type), params = super(FallbackConstraint, self).process(lookup_type, value, connection)
+        internal_type = self.field.get_internal_type() if self.field else None
+        return FallbackColumns(self.columns, db_type, internal_type), params
+
+    def relabeled_clone(self, change_map):
+        columns = FallbackColumns(self.columns).relabeled_clone(change_map).columns
+        return self.__class__(columns, self.field)
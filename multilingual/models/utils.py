@@ -4,6 +4,7 @@ Utilities for models and queries.
 from django.db.models.constants import LOOKUP_SEP
 from django.db.models.fields import FieldDoesNotExist
 
+from multilingual.languages import get_active, get_all, is_valid
 from multilingual.utils import sanitize_language_code
 
 from .fields import TranslationProxyField, TRANSLATION_FIELD_NAME
@@ -22,16 +23,60 @@ def _get_proxy_or_none(opts, field_name):
         return None
 
 
-def expand_lookup(opts, field_name):
+def expand_lookup(opts, lookup, active_language=None):
     """
-    Utility that expands simple multilingual lookup to lookup which can be handled by DJango ORM.
+    Utility that expands multilingual lookup to lookup which can be handled by DJango ORM.
+
+    Relation to translation in active language is replaced by relation with explicit language code, so all lookups
+    for the same language share single join. If `active_language` is provided, it is used instead of active language.
     """
+    parts = lookup.split(LOOKUP_SEP)
+    field_name = parts[0]
+
+    if field_name == TRANSLATION_FIELD_NAME:
+        parts[0] = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(active_language or get_active()))
+        return LOOKUP_SEP.join(parts)
+
     # Check if field is a translation
     field = _get_proxy_or_none(opts, field_name)
     if field is None:
         # Not a multilingual lookup, return
-        return field_name
+        return lookup
 
     # Multilingual field, add 'TranslationRelation' to lookup
-    translation_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(field.language_code))
-    return LOOKUP_SEP.join((translation_name, field.field_name))
+    language_code = field.get_language_code(active_language)
+    translation_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(language_code))
+    return LOOKUP_SEP.join([translation_name, field.field_name] + parts[1:])
+
+
+def expand_fallback_lookup(opts, field_name, active_language=None):
+    """
+    Utility that expands multilingual lookup to list of lookups, one for each language to be tried.
+
+    Returns None if the field is not a multilingual field.
+    """
+    field = _get_proxy_or_none(opts, field_name)
+    if field is None:
+        return None
+
+    lookups = []
+    for language_code in field.get_language_codes(active_language):
+        translation_name = '%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(language_code))
+        lookups.append(LOOKUP_SEP.join((translation_name, field.field_name)))
+    return lookups
+
+
+def get_translation_subquery(model, language_codes=None, **lookups):
+    """
+    Returns queryset of primary keys of objects which have a translation matching lookups in any of the languages.
+
+    All languages are used if `language_codes` is not provided.
+    """
+    if language_codes is None:
+        language_codes = get_all()
+    else:
+        for language_code in language_codes:
+            if not is_valid(language_code):
+                raise ValueError("Invalid language '%s'" % language_code)
+    translation_model = model._meta.translation_model
+    return translation_model._default_manager.filter(language_code__in=language_codes, **lookups).values('master')
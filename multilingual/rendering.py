@@ -0,0 +1,73 @@
+"""
+Rendering of content in several languages at once.
+"""
+from multiprocessing.pool import ThreadPool
+
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.template import Context, loader
+from django.utils import translation
+from django.utils.datastructures import SortedDict
+
+from multilingual.languages import get_all, locked
+from multilingual.models.fields import TRANSLATION_FIELD_NAME
+from multilingual.utils import sanitize_language_code
+
+
+def prefetch_translations(queryset, language_codes=None):
+    """
+    Returns queryset which loads translations for all languages by single query, all languages by default.
+
+    Evaluated queryset can be shared by renderings in different languages without further queries.
+    """
+    if language_codes is None:
+        language_codes = get_all()
+    relations = ['%s_%s' % (TRANSLATION_FIELD_NAME, sanitize_language_code(l)) for l in language_codes]
+    return queryset.select_related(*relations)
+
+
+def _call_locked(func, language_code):
+    # Calls function with locked and activated language
+    try:
+        with locked(language_code):
+            with translation.override(language_code):
+                return func()
+    finally:
+        # Worker threads must not leave database connections open
+        for connection in connections.all():
+            connection.close()
+
+
+def render_languages(func, language_codes=None, processes=None):
+    """
+    Calls `func` for each language in a pool of threads, all languages by default.
+
+    Language is locked and activated in the thread during the call. Returns dictionary with results for each
+    language. `processes` is the number of threads, number of languages by default.
+    """
+    if language_codes is None:
+        language_codes = get_all()
+    if not language_codes:
+        return SortedDict()
+    pool = ThreadPool(processes or len(language_codes))
+    try:
+        results = [pool.apply_async(_call_locked, (func, l)) for l in language_codes]
+        return SortedDict((l, result.get()) for l, result in zip(language_codes, results))
+    finally:
+        pool.terminate()
+
+
+def render_template_languages(template, dictionary=None, language_codes=None, processes=None):
+    """
+    Renders template for each language in a pool of threads, see `render_languages`.
+
+    `template` is either a template name or a template object. Querysets in `dictionary` are evaluated before
+    rendering, so they are shared by all languages, use `prefetch_translations` to load all their translations.
+    """
+    if isinstance(template, basestring):
+        template = loader.get_template(template)
+    dictionary = dictionary or {}
+    for value in dictionary.values():
+        if isinstance(value, QuerySet):
+            len(value)
+    return render_languages(lambda: template.render(Context(dictionary)), language_codes, processes)
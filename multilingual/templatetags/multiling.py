@@ -1,10 +1,11 @@
 """
 Template tags provided by multilingual
 """
-import re
-
 from django import template
+from django.utils.encoding import force_text
+
 from multilingual import languages
+from multilingual.alternates import get_alternate_urls
 
 
 register = template.Library()
@@ -13,6 +14,8 @@ register = template.Library()
 class MlLockNode(template.Node):
     """
     Locks language and stores value in variable
+
+    Language code is either a string resolved at compile time or a filter expression resolved at render.
     """
     def __init__(self, nodelist, language_code, varname=None):
         super(MlLockNode, self).__init__()
@@ -21,22 +24,19 @@ class MlLockNode(template.Node):
         self.varname = varname or 'ML_LANGUAGE'
 
     def render(self, context):
-        # If language_code is string, strip quotes
-        # otherwise resolve variable
-        if self.language_code[0] == self.language_code[-1] and self.language_code[0] in ('"',"'"):
-            language_code = self.language_code[1:-1]
-        else:
-            # Do not catch VariableDoesNotExist exception
-            language_code = template.Variable(self.language_code).resolve(context)
+        language_code = self.language_code
+        if not isinstance(language_code, basestring):
+            # Lazy values, e.g. `ML_LANGUAGE` from context processor, would be evaluated inside the lock
+            language_code = force_text(language_code.resolve(context))
 
         # Lock language, store code into context, render, restore context and release lock
-        languages.lock(language_code)
-        context.push()
-        context[self.varname] = languages.get_active()
-        output = self.nodelist.render(context)
-        context.pop()
-        languages.release()
-        return output
+        with languages.locked(language_code):
+            context.push()
+            try:
+                context[self.varname] = language_code
+                return self.nodelist.render(context)
+            finally:
+                context.pop()
 
 
 def ml_lock(parser, token):
@@ -56,18 +56,23 @@ def ml_lock(parser, token):
             multilingual in czech with code {{ var1 }}
         {% endml_lock %}
     """
-    #TODO: rewrite this parsing in style of django.template.defaulttags.do_with or other tag
-    try:
-        tag_name, args = token.split_contents()
-    except ValueError:
-        raise template.TemplateSyntaxError("%r tag requires arguments" % token.contents.split()[0])
-    #TODO: derived TokenParser might be better
-    match = re.match(r'^(?P<language_code>[^ \t]*)([ \t]+as[ \t]+(?P<varname>\w+))?$', args)
-    if match is None:
+    bits = token.split_contents()
+    tag_name = bits[0]
+    if len(bits) == 2:
+        varname = None
+    elif len(bits) == 4 and bits[2] == 'as':
+        varname = bits[3]
+    else:
         raise template.TemplateSyntaxError("%r tag has incorrect arguments" % tag_name)
-    language_code = match.groupdict()['language_code']
-    varname = match.groupdict().get('varname')
-    nodelist = parser.parse(('end%r' % tag_name,))
+
+    language_code = parser.compile_filter(bits[1])
+    if not language_code.filters and not isinstance(language_code.var, template.Variable):
+        # Language code is a string literal, resolve it right now
+        language_code = language_code.var
+        if not languages.is_valid(language_code):
+            raise template.TemplateSyntaxError("%r tag got invalid language '%s'" % (tag_name, language_code))
+
+    nodelist = parser.parse(('end%s' % tag_name,))
     parser.delete_first_token()
     return MlLockNode(nodelist, language_code, varname)
 
@@ -76,3 +81,29 @@ def ml_lock(parser, token):
 # {% ml_lock language_code %}multilingual in {{ language_code }} language{% endml_lock %}
 # {% ml_lock language_code as var1 %}Language_code stored in {{ var1 }}{% endml_lock %}
 register.tag('ml_lock', ml_lock)
+
+
+def ml_alternates(context, obj):
+    """
+    Returns list of alternate language versions of the object for language switchers and `hreflang` links.
+
+    Each item is a dictionary with `language_code`, `name` and `url`. URLs are absolute if request is in context.
+
+    Example::
+        {% ml_alternates flatpage as alternates %}
+        {% for alternate in alternates %}
+            <link rel="alternate" hreflang="{{ alternate.language_code }}" href="{{ alternate.url }}" />
+        {% endfor %}
+    """
+    request = context.get('request')
+    names = languages.get_dict()
+    alternates = []
+    for language_code, url in get_alternate_urls(obj).items():
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        alternates.append({'language_code': language_code, 'name': names[language_code], 'url': url})
+    return alternates
+
+
+# {% ml_alternates object as alternates %}
+register.assignment_tag(ml_alternates, takes_context=True)
@@ -0,0 +1,34 @@
+"""
+Model admins for testing
+"""
+from multilingual.admin import MultilingualModelAdmin, MultilingualTabularInline, TranslationListFilter
+
+from .models import Comment
+
+
+class ArticleAdmin(MultilingualModelAdmin):
+    list_display = ('slug', 'title', 'title_en', 'title_any', 'translation_coverage')
+    list_filter = (TranslationListFilter, )
+    search_fields = ('slug', 'title')
+    ordering = ('slug', )
+
+
+class AllLanguagesArticleAdmin(ArticleAdmin):
+    all_languages = True
+    search_all_languages = True
+
+
+class CommentAdmin(MultilingualModelAdmin):
+    list_display = ('article', 'text')
+
+
+class CommentInline(MultilingualTabularInline):
+    model = Comment
+
+
+class InlinesArticleAdmin(MultilingualModelAdmin):
+    inlines = (CommentInline, )
+
+
+class AllLanguagesInlinesArticleAdmin(InlinesArticleAdmin):
+    all_languages = True
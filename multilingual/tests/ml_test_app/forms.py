@@ -3,9 +3,9 @@ Forms for testing
 """
 from django import forms
 
-from multilingual.forms import MultilingualModelForm
+from multilingual.forms import MultilingualAllLanguagesModelForm, MultilingualModelForm
 
-from .models import Article
+from .models import Article, Category, Comment
 
 
 class SimpleForm(MultilingualModelForm):
@@ -30,3 +30,29 @@ class CustomForm(MultilingualModelForm):
 
     class Meta:
         model = Article
+
+
+class AllLanguagesForm(MultilingualAllLanguagesModelForm):
+    class Meta:
+        model = Article
+
+
+class AllLanguagesFieldsForm(MultilingualAllLanguagesModelForm):
+    class Meta:
+        model = Article
+        fields = ('slug', 'title')
+
+
+class CommentForm(MultilingualModelForm):
+    class Meta:
+        model = Comment
+
+
+class CategoryForm(MultilingualModelForm):
+    class Meta:
+        model = Category
+
+
+class CategoryAllLanguagesForm(MultilingualAllLanguagesModelForm):
+    class Meta:
+        model = Category
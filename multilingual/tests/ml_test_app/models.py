@@ -15,3 +15,26 @@ class Article(MultilingualModel):
 
     def __unicode__(self):
         return self.slug
+
+
+class Comment(MultilingualModel):
+    article = models.ForeignKey(Article, related_name='comments')
+
+    class Translation:
+        text = models.CharField(max_length=100)
+
+    def __unicode__(self):
+        return u'Comment %s' % self.pk
+
+
+class Category(MultilingualModel):
+    class Translation:
+        name = models.CharField(max_length=50, unique=True)
+        section = models.CharField(max_length=50)
+        slug = models.SlugField()
+
+        class Meta:
+            unique_together = (('section', 'slug'), )
+
+    def __unicode__(self):
+        return u'Category %s' % self.pk
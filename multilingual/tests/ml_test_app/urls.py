@@ -1,14 +1,30 @@
 from django.conf.urls import include, patterns, url
 from django.contrib.admin.sites import AdminSite
 
-from multilingual.admin import MultilingualModelAdmin
-
-from .models import Article
+from .admin import AllLanguagesArticleAdmin, AllLanguagesInlinesArticleAdmin, ArticleAdmin, CommentAdmin, \
+    InlinesArticleAdmin
+from .models import Article, Comment
 
 SITE = AdminSite()
 
-SITE.register(Article, MultilingualModelAdmin)
+SITE.register(Article, ArticleAdmin)
+SITE.register(Comment, CommentAdmin)
+
+ALL_LANGUAGES_SITE = AdminSite(name='all_languages_admin')
+
+ALL_LANGUAGES_SITE.register(Article, AllLanguagesArticleAdmin)
+
+INLINES_SITE = AdminSite(name='inlines_admin')
+
+INLINES_SITE.register(Article, InlinesArticleAdmin)
+
+ALL_LANGUAGES_INLINES_SITE = AdminSite(name='all_languages_inlines_admin')
+
+ALL_LANGUAGES_INLINES_SITE.register(Article, AllLanguagesInlinesArticleAdmin)
 
 urlpatterns = patterns('',
     url(r'^admin/', include(SITE.urls)),
+    url(r'^all-languages-admin/', include(ALL_LANGUAGES_SITE.urls)),
+    url(r'^inlines-admin/', include(INLINES_SITE.urls)),
+    url(r'^all-languages-inlines-admin/', include(ALL_LANGUAGES_INLINES_SITE.urls)),
 )
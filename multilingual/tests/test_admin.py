@@ -2,10 +2,14 @@
 """
 This tests standard behaviour of multilingual models
 """
+from django.db import connection
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.translation import activate, deactivate_all, trans_real
 
 from multilingual import MultilingualModelForm
+from multilingual.forms import MultilingualAllLanguagesModelForm
+from multilingual.languages import get_active, lock, release
 
 from .base import MultilingualSetupMixin
 
@@ -51,6 +55,16 @@ class TestModelAdmin(MultilingualSetupMixin, TransactionTestCase):
         self.assertEqual(response.context['title'], 'Add article for language English')
         self.assertEqual(response.context['ml_admin_language'], 'en')
 
+    def test_view_invalid_language(self):
+        # Invalid language does not release outer lock
+        lock('fr')
+        try:
+            self.assertRaises(ValueError, self.client.get, '/admin/ml_test_app/article/add/?ml_admin_language=de')
+            self.assertRaises(ValueError, self.client.get, '/admin/ml_test_app/article/1/?ml_admin_language=de')
+            self.assertEqual(get_active(), 'fr')
+        finally:
+            release()
+
     def test_add_view_post(self):
         from .ml_test_app.models import Article
 
@@ -169,3 +183,234 @@ class TestModelAdmin(MultilingualSetupMixin, TransactionTestCase):
         self.assertEqual(obj.title_en, 'Changed article')
         self.assertEqual(obj.content_cs, u'Žluťoučký kůň')
         self.assertEqual(obj.content_en, 'Brand new content')
+
+    def test_change_view_post_unchanged(self):
+        data = {'ml_admin_language': 'cs', 'slug': 'first', 'title': u'První článek', 'content': u'Žluťoučký kůň'}
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post('/admin/ml_test_app/article/1/', data=data)
+
+        # Translation is not written
+        self.assertEqual([q for q in captured if 'UPDATE "ml_test_app_articletranslation"' in q['sql'] or
+                          'INSERT INTO "ml_test_app_articletranslation"' in q['sql']], [])
+        self.assertRedirects(response, '/admin/ml_test_app/article/')
+
+    def test_change_view_get_queries(self):
+        # Change view does not select translations used by changelist, saving would write them back
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/admin/ml_test_app/article/1/')
+        self.assertEqual([q for q in captured if 'FROM "ml_test_app_article" ' in q['sql'] and
+                          'JOIN "ml_test_app_articletranslation"' in q['sql']], [])
+        self.assertEqual(response.status_code, 200)
+
+    def test_changelist_view(self):
+        from .ml_test_app.models import Article
+
+        response = self.client.get('/admin/ml_test_app/article/')
+        self.assertContains(response, '<a href="?o=2.1">Title</a>')
+        self.assertEqual([(a.slug, a.title, a.title_en, a.title_any) for a in response.context['cl'].result_list],
+                         [('first', u'První článek', 'First article', u'První článek'),
+                          ('only-czech', u'Český článek', None, u'Český článek'),
+                          ('only-english', None, 'English article', None), ('untranslated', None, None, None)])
+
+        # Translations are selected with objects
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get('/admin/ml_test_app/article/')
+        for i in range(10):
+            Article.objects.create(slug='article-%d' % i, title_cs=u'Článek', title_en='Article')
+        with self.assertNumQueries(len(captured)):
+            response = self.client.get('/admin/ml_test_app/article/')
+        self.assertEqual(len(response.context['cl'].result_list), 14)
+
+        # Ordering by translated field
+        response = self.client.get('/admin/ml_test_app/article/?o=-3.1')
+        self.assertEqual([a.slug for a in response.context['cl'].result_list][:4],
+                         ['first', 'only-english', 'article-0', 'article-1'])
+
+    def test_changelist_view_related(self):
+        from .ml_test_app.models import Comment
+
+        # Translations are selected together with foreign keys in list display
+        Comment.objects.create(article_id=1, text_cs=u'Komentář')
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get('/admin/ml_test_app/comment/')
+        for i in range(5):
+            Comment.objects.create(article_id=1, text_cs=u'Komentář %d' % i)
+        with self.assertNumQueries(len(captured)):
+            response = self.client.get('/admin/ml_test_app/comment/')
+        self.assertEqual(len(response.context['cl'].result_list), 6)
+        self.assertContains(response, u'Komentář 4')
+
+    def test_changelist_translation_coverage(self):
+        response = self.client.get('/admin/ml_test_app/article/')
+        self.assertContains(response, '<th scope="col" class="column-translation_coverage"><div class="text">'
+                                      '<span>Translations</span></div><div class="clear"></div></th>', html=True)
+        self.assertContains(response, '<td>cs en <del>en-us</del> <del>fr</del></td>', html=True)
+        self.assertContains(response, '<td><del>cs</del> <del>en</del> <del>en-us</del> <del>fr</del></td>', html=True)
+
+        # Translated languages are loaded by single query for all objects
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get('/admin/ml_test_app/article/')
+        self.assertEqual(len([q for q in captured if 'language_code' in q['sql'] and 'JOIN' not in q['sql']]), 1)
+
+    def test_changelist_translation_filter(self):
+        response = self.client.get('/admin/ml_test_app/article/')
+        self.assertContains(response, '<a href="?ml_translation=en">English</a>')
+        self.assertContains(response, u'<a href="?ml_translation=-fr">Missing Français</a>')
+
+        response = self.client.get('/admin/ml_test_app/article/?ml_translation=en')
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], ['first', 'only-english'])
+        response = self.client.get('/admin/ml_test_app/article/?ml_translation=-cs')
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], ['only-english', 'untranslated'])
+
+    def test_changelist_search(self):
+        response = self.client.get('/admin/ml_test_app/article/', {'q': u'článek'})
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], ['first', 'only-czech'])
+        # Translations are searched by subquery
+        sql, params = response.context['cl'].queryset.query.sql_with_params()
+        self.assertIn('IN (SELECT', sql)
+        response = self.client.get('/admin/ml_test_app/article/', {'q': 'article'})
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], [])
+        response = self.client.get('/admin/ml_test_app/article/', {'q': u'first článek'})
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], ['first'])
+        response = self.client.get('/admin/ml_test_app/article/', {'q': 'czech'})
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], ['only-czech'])
+
+        # Search in all languages
+        response = self.client.get('/all-languages-admin/ml_test_app/article/', {'q': 'article'})
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], ['first', 'only-english'])
+        response = self.client.get('/all-languages-admin/ml_test_app/article/', {'q': u'článek'})
+        self.assertEqual([a.slug for a in response.context['cl'].result_list], ['first', 'only-czech'])
+
+    def test_all_languages_change_view_get(self):
+        # Session, user, object, all translations and two queries for the history link
+        with self.assertNumQueries(6):
+            response = self.client.get('/all-languages-admin/ml_test_app/article/1/')
+
+        self.assertNotContains(response, 'ml_admin_language')
+        self.assertNotContains(response, 'language-tabs')
+        self.assertIsInstance(response.context['adminform'].form, MultilingualAllLanguagesModelForm)
+        self.assertTrue(response.context['ml_admin_all_languages'])
+        self.assertContains(response, '<input class="vTextField" id="id_slug" maxlength="50" name="slug" type="text" '
+                                      'value="first" />', html=True)
+        self.assertContains(response, u'<input class="vTextField" id="id_cs-title" maxlength="100" name="cs-title" '
+                                      u'type="text" value="První článek" />', html=True)
+        self.assertContains(response, '<input class="vTextField" id="id_en-title" maxlength="100" name="en-title" '
+                                      'type="text" value="First article" />', html=True)
+        self.assertContains(response, '<input class="vTextField" id="id_fr-title" maxlength="100" name="fr-title" '
+                                      'type="text" />', html=True)
+
+    def test_all_languages_change_view_post(self):
+        from .ml_test_app.models import Article
+
+        data = {'slug': 'changed', 'cs-title': 'Opravený článek', 'cs-content': 'Úplně jiný obsah',
+                'en-title': 'First article', 'en-content': 'Yellow horse', 'fr-title': 'Nouvel article',
+                'fr-content': '', 'en-us-title': '', 'en-us-content': ''}
+        response = self.client.post('/all-languages-admin/ml_test_app/article/1/', data=data)
+
+        self.assertRedirects(response, '/all-languages-admin/ml_test_app/article/')
+
+        # Check changed object
+        obj = Article.objects.get(pk=1)
+        self.assertEqual(obj.slug, 'changed')
+        self.assertEqual(obj.title_cs, u'Opravený článek')
+        self.assertEqual(obj.content_cs, u'Úplně jiný obsah')
+        self.assertEqual(obj.title_en, 'First article')
+        self.assertEqual(obj.content_en, 'Yellow horse')
+        self.assertEqual(obj.title_fr, 'Nouvel article')
+        self.assertIsNone(obj.translation_en_us)
+
+    def test_all_languages_change_view_post_invalid(self):
+        from .ml_test_app.models import Article
+
+        data = {'slug': 'changed', 'cs-title': '', 'cs-content': 'Úplně jiný obsah', 'en-title': 'First article',
+                'en-content': 'Yellow horse', 'fr-title': '', 'fr-content': 'Nouveau contenu'}
+        response = self.client.post('/all-languages-admin/ml_test_app/article/1/', data=data)
+
+        self.assertEqual(response.status_code, 200)
+        translation_forms = response.context['adminform'].form.translation_forms
+        self.assertEqual([(f.language_code, f.errors.keys()) for f in translation_forms],
+                         [('cs', ['title']), ('en', []), ('en-us', []), ('fr', ['title'])])
+        # Errors of translations are reported by the form
+        self.assertEqual(len(response.context['errors']), 2)
+
+        # Nothing is changed
+        obj = Article.objects.get(pk=1)
+        self.assertEqual(obj.slug, 'first')
+        self.assertEqual(obj.title_cs, u'První článek')
+        self.assertIsNone(obj.translation_fr)
+
+    def test_all_languages_add_view_post(self):
+        from .ml_test_app.models import Article
+
+        data = {'slug': 'added', 'cs-title': 'Nový článek', 'en-title': 'New article', 'en-content': 'New content'}
+        response = self.client.post('/all-languages-admin/ml_test_app/article/add/', data=data)
+
+        self.assertRedirects(response, '/all-languages-admin/ml_test_app/article/')
+
+        # Check created object
+        obj = Article.objects.get(slug='added')
+        self.assertEqual(obj.title_cs, u'Nový článek')
+        self.assertEqual(obj.content_cs, '')
+        self.assertEqual(obj.title_en, 'New article')
+        self.assertEqual(obj.content_en, 'New content')
+        self.assertIsNone(obj.translation_fr)
+
+    def _create_comments(self, count):
+        from .ml_test_app.models import Article, Comment
+
+        article = Article.objects.get(pk=1)
+        for i in range(count):
+            comment = Comment(article=article)
+            comment.text_cs = u'Komentář %d' % i
+            comment.text_en = 'Comment %d' % i
+            comment.save()
+
+    def test_inlines_change_view_get(self):
+        self._create_comments(3)
+
+        response = self.client.get('/inlines-admin/ml_test_app/article/1/')
+        self.assertContains(response, u'<input class="vTextField" id="id_comments-0-text" maxlength="100" '
+                                      u'name="comments-0-text" type="text" value="Komentář 0" />', html=True)
+        response = self.client.get('/inlines-admin/ml_test_app/article/1/?ml_admin_language=en')
+        self.assertContains(response, '<input class="vTextField" id="id_comments-0-text" maxlength="100" '
+                                      'name="comments-0-text" type="text" value="Comment 0" />', html=True)
+
+        # Translations for the locked language are loaded with inline objects
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get('/inlines-admin/ml_test_app/article/1/?ml_admin_language=en')
+        self._create_comments(10)
+        with self.assertNumQueries(len(captured)):
+            self.client.get('/inlines-admin/ml_test_app/article/1/?ml_admin_language=en')
+
+    def test_inlines_change_view_post(self):
+        from .ml_test_app.models import Comment
+
+        self._create_comments(1)
+        data = {'ml_admin_language': 'en', 'slug': 'first', 'title': 'First article', 'content': 'Yellow horse',
+                'comments-TOTAL_FORMS': '2', 'comments-INITIAL_FORMS': '1', 'comments-MAX_NUM_FORMS': '1000',
+                'comments-0-id': '1', 'comments-0-article': '1', 'comments-0-text': 'Changed comment',
+                'comments-1-id': '', 'comments-1-article': '1', 'comments-1-text': 'New comment'}
+        response = self.client.post('/inlines-admin/ml_test_app/article/1/', data=data)
+
+        self.assertRedirects(response, '/inlines-admin/ml_test_app/article/')
+        self.assertEqual([(c.text_cs, c.text_en) for c in Comment.objects.order_by('pk')],
+                         [(u'Komentář 0', 'Changed comment'), (None, 'New comment')])
+
+    def test_all_languages_inlines_change_view_post(self):
+        from .ml_test_app.models import Comment
+
+        # Inline objects are edited only in the active language
+        self._create_comments(1)
+        response = self.client.get('/all-languages-inlines-admin/ml_test_app/article/1/')
+        self.assertContains(response, u'<input class="vTextField" id="id_comments-0-text" maxlength="100" '
+                                      u'name="comments-0-text" type="text" value="Komentář 0" />', html=True)
+
+        data = {'slug': 'first', 'cs-title': u'První článek', 'cs-content': u'Žluťoučký kůň',
+                'en-title': 'First article', 'en-content': 'Yellow horse',
+                'comments-TOTAL_FORMS': '1', 'comments-INITIAL_FORMS': '1', 'comments-MAX_NUM_FORMS': '1000',
+                'comments-0-id': '1', 'comments-0-article': '1', 'comments-0-text': u'Změněný komentář'}
+        response = self.client.post('/all-languages-inlines-admin/ml_test_app/article/1/', data=data)
+
+        self.assertRedirects(response, '/all-languages-inlines-admin/ml_test_app/article/')
+        self.assertEqual([(c.text_cs, c.text_en) for c in Comment.objects.order_by('pk')],
+                         [(u'Změněný komentář', 'Comment 0')])
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Test context processors
+"""
+from django.template import Context, Template
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils.functional import Promise
+from django.utils.translation import activate, deactivate_all
+
+from multilingual import languages
+from multilingual.context_processors import multilingual
+
+from .base import TEST_LANGUAGES
+
+
+@override_settings(LANGUAGE_CODE='cs', LANGUAGES=TEST_LANGUAGES)
+class TestMultilingual(TestCase):
+    def tearDown(self):
+        deactivate_all()
+
+    def test_values(self):
+        activate('en-us')
+        context = multilingual(None)
+        for value in context.values():
+            self.assertIsInstance(value, Promise)
+
+        self.assertEqual(context['ML_LANGUAGE'], 'en-us')
+        self.assertEqual(list(context['ML_LANGUAGES']), ['cs', 'en', 'en-us', 'fr'])
+        self.assertEqual(context['ML_LANGUAGE_NAMES']['fr'], u'Français')
+        self.assertEqual(list(context['ML_FALLBACKS']), ['en', 'cs'])
+
+    def test_lazy(self):
+        context = multilingual(None)
+        # Values are evaluated when used
+        activate('fr')
+        self.assertEqual(context['ML_LANGUAGE'], 'fr')
+        self.assertEqual(list(context['ML_FALLBACKS']), ['cs'])
+        with languages.locked('en'):
+            self.assertEqual(context['ML_LANGUAGE'], 'en')
+
+    def test_template(self):
+        activate('en')
+        template = Template("{{ ML_LANGUAGE }}|{% if ML_LANGUAGE == 'en' %}yes{% endif %}|"
+                            "{% for code in ML_LANGUAGES %}{{ code }},{% endfor %}|"
+                            "{% for code, name in ML_LANGUAGE_NAMES.items %}{{ name }},{% endfor %}|"
+                            "{{ ML_LANGUAGE_NAMES.en }}|{{ ML_FALLBACKS|join:',' }}")
+        self.assertEqual(template.render(Context(multilingual(None))),
+                         u'en|yes|cs,en,en-us,fr,|Čeština,English,American,Français,|English|cs')
+
+    def test_lock(self):
+        activate('fr')
+        context = multilingual(None)
+        template = Template("{% load multiling %}{% ml_lock ML_LANGUAGE %}{{ ML_LANGUAGE }}{% endml_lock %}|"
+                            "{% ml_lock 'en' %}{% ml_lock ML_LANGUAGE as code %}{{ code }}{% endml_lock %}"
+                            "{% endml_lock %}")
+        self.assertEqual(template.render(Context(context)), 'fr|en')
+        with languages.locked(context['ML_LANGUAGE']):
+            self.assertEqual(languages.get_active(), 'fr')
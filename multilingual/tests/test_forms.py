@@ -2,11 +2,25 @@
 """
 This tests multilingual forms
 """
+from django import forms
+from django.contrib.admin.sites import AdminSite
+from django.db import connection, models
+from django.forms.models import inlineformset_factory, modelform_factory, modelformset_factory
 from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils.translation import activate, deactivate_all
 
+from multilingual.admin import MultilingualModelAdmin
+from multilingual.forms import (_translation_fields_cache, BaseMultilingualInlineFormSet, BaseMultilingualModelFormSet,
+                                MultilingualModelForm, get_unique_conflicts)
+
 from .base import MultilingualSetupMixin
 
+# Messages of unique checks of translations
+NAME_UNIQUE_ERROR = u'Položka Category translation s touto hodnotou v poli Name již existuje.'
+SLUG_UNIQUE_ERROR = u'Položka Category translation s touto hodnotou v poli Section a Slug již existuje.'
+
 
 class TestModelForm(MultilingualSetupMixin, TestCase):
     fixtures = ('ml_test_models.json', )
@@ -60,3 +74,279 @@ class TestModelForm(MultilingualSetupMixin, TestCase):
         self.assertTrue(form.is_bound)
         self.assertTrue(form.is_valid())
         self.assertEqual(form.instance.content, 'New content')
+
+    def test_form_save_changed(self):
+        from .ml_test_app.forms import ExcludeForm, SimpleForm
+        from .ml_test_app.models import Article
+
+        # Unchanged translation is not written
+        obj = Article.objects.get(slug='first')
+        data = {'slug': 'changed', 'title': u'První článek', 'content': u'Žluťoučký kůň'}
+        form = SimpleForm(data, instance=obj)
+        self.assertTrue(form.is_valid(), form.errors)
+        with CaptureQueriesContext(connection) as captured:
+            form.save()
+        self.assertEqual(len(captured), 1, captured.captured_queries)
+        self.assertNotIn('translation', captured[0]['sql'])
+        # Loaded translation is kept
+        with self.assertNumQueries(0):
+            self.assertEqual(obj.title, u'První článek')
+
+        # Translation changed before the form was created is written
+        obj = Article.objects.get(slug='changed')
+        obj.content = u'Změněný obsah'
+        form = SimpleForm({'slug': 'changed', 'title': u'První článek', 'content': u'Změněný obsah'}, instance=obj)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.changed_data, [])
+        form.save()
+        self.assertEqual(Article.objects.get(slug='changed').content_cs, u'Změněný obsah')
+
+        # Only changed translation is written
+        obj = Article.objects.get(slug='changed')
+        data = {'slug': 'changed', 'title': u'První článek', 'content': u'Nový obsah'}
+        form = SimpleForm(data, instance=obj)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.changed_data, ['content'])
+        with self.assertNumQueries(2):
+            form.save()
+        obj = Article.objects.get(slug='changed')
+        self.assertEqual((obj.title_cs, obj.content_cs, obj.title_en),
+                         (u'První článek', u'Nový obsah', 'First article'))
+
+        # Empty translation is not created
+        obj = Article.objects.get(slug='untranslated')
+        form = ExcludeForm({'content': ''}, instance=obj)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertFalse(Article.objects.get(slug='untranslated').translations.exists())
+
+        form = ExcludeForm({'content': 'New content'}, instance=obj)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        obj = Article.objects.get(slug='untranslated')
+        self.assertEqual((obj.title_cs, obj.content_cs), ('', 'New content'))
+
+    def test_form_unique(self):
+        from .ml_test_app.forms import CategoryForm
+        from .ml_test_app.models import Category
+
+        obj = Category()
+        obj.name_cs, obj.section_cs, obj.slug_cs = u'Zprávy', 'main', 'zpravy'
+        obj.name_en, obj.section_en, obj.slug_en = 'News', 'main', 'news'
+        obj.save()
+
+        # All unique checks are done by single query
+        form = CategoryForm({'name': u'Zprávy', 'section': 'main', 'slug': 'zpravy'})
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors, {'name': [NAME_UNIQUE_ERROR], '__all__': [SLUG_UNIQUE_ERROR]})
+
+        # Translations in other languages do not conflict
+        form = CategoryForm({'name': 'News', 'section': 'main', 'slug': 'news'})
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        # Translation does not conflict with itself, unchanged fields are not checked
+        form = CategoryForm({'name': u'Zprávy', 'section': 'main', 'slug': 'zpravy'}, instance=obj)
+        with self.assertNumQueries(0):
+            self.assertTrue(form.is_valid(), form.errors)
+        form = CategoryForm({'name': u'Zprávy', 'section': 'main', 'slug': 'news'}, instance=obj)
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors, {'__all__': [SLUG_UNIQUE_ERROR]})
+
+        # Conflicts are found by the database, values are converted as in queries
+        obj = Category()
+        obj.name_en, obj.section_en, obj.slug_en = '5', 'main', 'five'
+        obj.save()
+        translation_model = Category._meta.translation_model
+        with self.assertNumQueries(1):
+            self.assertEqual(get_unique_conflicts(translation_model, [('en', {'name': 5}, ['name'])]),
+                             [('en', ('name', ))])
+
+    def test_translation_fields_cache(self):
+        from .ml_test_app.models import Article
+
+        form_class = modelform_factory(Article, form=MultilingualModelForm, fields=('slug', 'title'))
+        cache_size = len(_translation_fields_cache)
+        # Fields for the same options are taken from cache
+        other_class = modelform_factory(Article, form=MultilingualModelForm, fields=('slug', 'title'))
+        self.assertEqual(len(_translation_fields_cache), cache_size)
+        self.assertEqual(other_class.base_fields.keys(), ['slug', 'title'])
+        self.assertIsNot(other_class.base_fields['title'], form_class.base_fields['title'])
+        self.assertEqual(other_class.base_fields['title'].max_length, 100)
+
+        # Cached fields are not shared by form classes
+        form_class.base_fields['title'].widget.attrs['class'] = 'changed'
+        form_class.base_fields['title'].error_messages['required'] = 'Changed'
+        other_class = modelform_factory(Article, form=MultilingualModelForm, fields=('slug', 'title'))
+        self.assertNotIn('class', other_class.base_fields['title'].widget.attrs)
+        self.assertNotEqual(other_class.base_fields['title'].error_messages['required'], 'Changed')
+
+        modelform_factory(Article, form=MultilingualModelForm, fields=('slug', 'content'))
+        self.assertEqual(len(_translation_fields_cache), cache_size + 1)
+
+        # Options which differ for each call are not cached
+        for i in range(2):
+            modelform_factory(Article, form=MultilingualModelForm, fields=('slug', 'title'),
+                              widgets={'title': forms.Textarea()})
+            modelform_factory(Article, form=MultilingualModelForm, fields=('slug', 'title'),
+                              formfield_callback=lambda f, **kwargs: f.formfield(**kwargs))
+        self.assertEqual(len(_translation_fields_cache), cache_size + 1)
+
+    def test_translation_fields_cache_admin(self):
+        from .ml_test_app.models import Article
+
+        model_admin = MultilingualModelAdmin(Article, AdminSite())
+        model_admin.get_form(RequestFactory().get('/'))
+        cache_size = len(_translation_fields_cache)
+        # Admin creates form class for each request, translated fields are not created again
+        form_class = model_admin.get_form(RequestFactory().get('/'))
+        self.assertEqual(len(_translation_fields_cache), cache_size)
+        self.assertEqual(form_class.base_fields.keys(), ['slug', 'title', 'content'])
+        self.assertEqual(form_class.base_fields['title'].widget.attrs, {'class': 'vTextField', 'maxlength': '100'})
+        # Fields are cached for admin class, not its instances
+        MultilingualModelAdmin(Article, model_admin.admin_site).get_form(RequestFactory().get('/'))
+        self.assertEqual(len(_translation_fields_cache), cache_size)
+
+        # Overridden hooks may depend on request
+        class RequestArticleAdmin(MultilingualModelAdmin):
+            def formfield_for_dbfield(self, db_field, **kwargs):
+                field = super(RequestArticleAdmin, self).formfield_for_dbfield(db_field, **kwargs)
+                if field is not None:
+                    field.help_text = kwargs['request'].GET.get('help', '')
+                return field
+
+        model_admin = RequestArticleAdmin(Article, AdminSite())
+        model_admin.get_form(RequestFactory().get('/', {'help': 'First'}))
+        form_class = model_admin.get_form(RequestFactory().get('/', {'help': 'Second'}))
+        self.assertEqual(len(_translation_fields_cache), cache_size)
+        self.assertEqual(form_class.base_fields['title'].help_text, 'Second')
+
+        class OverridesArticleAdmin(MultilingualModelAdmin):
+            formfield_overrides = {models.TextField: {'widget': forms.TextInput}}
+
+        class ChoiceArticleAdmin(MultilingualModelAdmin):
+            def formfield_for_choice_field(self, db_field, request=None, **kwargs):
+                return super(ChoiceArticleAdmin, self).formfield_for_choice_field(db_field, request, **kwargs)
+
+        for admin_class in (OverridesArticleAdmin, ChoiceArticleAdmin):
+            admin_class(Article, AdminSite()).get_form(RequestFactory().get('/'))
+        self.assertEqual(len(_translation_fields_cache), cache_size)
+
+    def test_formset(self):
+        from .ml_test_app.forms import SimpleForm
+        from .ml_test_app.models import Article
+
+        FormSet = modelformset_factory(Article, form=SimpleForm, formset=BaseMultilingualModelFormSet, extra=1)
+        formset = FormSet()
+        self.assertEqual([f.initial.get('title') for f in formset.forms],
+                         [u'První článek', u'Český článek', '', '', None])
+
+        # Translations are loaded for all objects by single query
+        with CaptureQueriesContext(connection) as captured:
+            FormSet().as_p()
+        for i in range(10):
+            Article.objects.create(slug='article-%d' % i, title_cs=u'Článek')
+        with self.assertNumQueries(len(captured)):
+            FormSet().as_p()
+
+        # Translations of objects bound to a language
+        formset = FormSet(queryset=Article.objects.language('en').filter(slug__in=('first', 'only-czech')))
+        with self.assertNumQueries(2):
+            self.assertEqual([f.initial.get('title') for f in formset.forms], ['First article', '', None])
+
+    def test_inline_formset(self):
+        from .ml_test_app.forms import CommentForm
+        from .ml_test_app.models import Article, Comment
+
+        article = Article.objects.get(slug='first')
+        for i in range(3):
+            Comment.objects.create(article=article, text_cs=u'Komentář %d' % i)
+        FormSet = inlineformset_factory(Article, Comment, form=CommentForm,
+                                        formset=BaseMultilingualInlineFormSet, extra=0)
+        with self.assertNumQueries(2):
+            formset = FormSet(instance=article)
+            self.assertEqual([f.initial['text'] for f in formset.forms],
+                             [u'Komentář 0', u'Komentář 1', u'Komentář 2'])
+
+
+class TestAllLanguagesModelForm(MultilingualSetupMixin, TestCase):
+    fixtures = ('ml_test_models.json', )
+
+    def setUp(self):
+        activate('cs')
+
+    def tearDown(self):
+        deactivate_all()
+
+    def test_modelforms(self):
+        from .ml_test_app.forms import AllLanguagesForm, AllLanguagesFieldsForm
+
+        self.assertEqual(AllLanguagesForm.base_fields.keys(), ['slug'])
+        self.assertEqual(AllLanguagesForm.translation_form_class.base_fields.keys(), ['title', 'content'])
+        self.assertEqual(AllLanguagesFieldsForm.base_fields.keys(), ['slug'])
+        self.assertEqual(AllLanguagesFieldsForm.translation_form_class.base_fields.keys(), ['title'])
+
+    def test_form_unbound(self):
+        from .ml_test_app.forms import AllLanguagesForm
+        from .ml_test_app.models import Article
+
+        obj = Article.objects.get(slug='first')
+        # Translations are loaded by single query
+        with self.assertNumQueries(1):
+            form = AllLanguagesForm(instance=obj)
+        self.assertFalse(form.is_bound)
+        self.assertEqual([(f.prefix, f.instance.pk is not None, f.initial['title']) for f in form.translation_forms],
+                         [('cs', True, u'První článek'), ('en', True, 'First article'), ('en-us', False, ''),
+                          ('fr', False, '')])
+
+    def test_form_bound(self):
+        from .ml_test_app.forms import AllLanguagesForm
+        from .ml_test_app.models import Article
+
+        obj = Article.objects.get(slug='only-czech')
+        data = {'slug': 'changed', 'cs-title': u'Český článek', 'cs-content': '', 'en-title': 'Czech article',
+                'en-content': 'Content'}
+        form = AllLanguagesForm(data, instance=obj)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertTrue(form.has_changed())
+        # Two queries save the object, unchanged translation is not saved, new translations are created by single query
+        with self.assertNumQueries(3):
+            form.save()
+
+        obj = Article.objects.get(slug='changed')
+        self.assertEqual(obj.title_cs, u'Český článek')
+        self.assertEqual(obj.title_en, 'Czech article')
+        self.assertEqual(obj.content_en, 'Content')
+        self.assertIsNone(obj.translation_fr)
+
+        data = {'slug': 'changed', 'cs-title': '', 'fr-content': 'Contenu'}
+        form = AllLanguagesForm(data, instance=obj)
+        self.assertFalse(form.is_valid())
+        # Existing translations can not be left empty, new translations only if no field is filled
+        self.assertEqual([f.errors.keys() for f in form.translation_forms], [['title'], ['title'], [], ['title']])
+        self.assertEqual(sorted(form.errors.keys()), ['cs-title', 'en-title', 'fr-title'])
+
+    def test_form_unique(self):
+        from .ml_test_app.forms import CategoryAllLanguagesForm
+        from .ml_test_app.models import Category
+
+        obj = Category()
+        obj.name_en, obj.section_en, obj.slug_en = 'News', 'main', 'news'
+        obj.save()
+
+        data = {'cs-name': 'News', 'cs-section': 'main', 'cs-slug': 'news',
+                'en-name': 'News', 'en-section': 'other', 'en-slug': 'news'}
+        form = CategoryAllLanguagesForm(data)
+        # Translations for all languages are checked by single query
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+            self.assertFalse(form.is_valid())
+        self.assertEqual([(f.language_code, f.errors) for f in form.translation_forms],
+                         [('cs', {}), ('en', {'name': [NAME_UNIQUE_ERROR]}),
+                          ('en-us', {}), ('fr', {})])
+        self.assertEqual(form.errors, {'en-name': [NAME_UNIQUE_ERROR]})
+
+        form = CategoryAllLanguagesForm(data, instance=obj)
+        self.assertTrue(form.is_valid(), form.errors)
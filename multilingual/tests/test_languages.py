@@ -2,6 +2,8 @@
 """
 Test language setters, getters and fallbacks
 """
+from threading import Thread
+
 from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -30,6 +32,18 @@ class TestLanguages(TestCase):
     def test_get_all(self):
         self.assertEqual(languages.get_all(), ['cs', 'en', 'en-us', 'fr'])
 
+    def test_is_valid(self):
+        self.assertTrue(languages.is_valid('cs'))
+        self.assertTrue(languages.is_valid('en-us'))
+        self.assertFalse(languages.is_valid('de'))
+        self.assertFalse(languages.is_valid('en_us'))
+
+        # Cached languages are updated when settings change
+        with self.settings(LANGUAGES=(('de', 'German'), ('cs', 'Czech'))):
+            self.assertTrue(languages.is_valid('de'))
+            self.assertEqual(languages.get_all(), ['de', 'cs'])
+        self.assertFalse(languages.is_valid('de'))
+
     def test_get_settings_default(self):
         self.assertEqual(languages.get_settings_default(), 'cs')
 
@@ -77,3 +91,64 @@ class TestLanguages(TestCase):
 
         self.assertFalse(languages.is_locked())
         self.assertEqual(languages.get_active(), 'en')
+
+    def test_lock_nested(self):
+        activate('en')
+        languages.lock('fr')
+        languages.lock('cs')
+        self.assertEqual(languages.get_active(), 'cs')
+
+        languages.release()
+        self.assertTrue(languages.is_locked())
+        self.assertEqual(languages.get_active(), 'fr')
+
+        languages.release()
+        self.assertFalse(languages.is_locked())
+        self.assertEqual(languages.get_active(), 'en')
+
+        # Extra release does nothing
+        languages.release()
+        self.assertEqual(languages.get_active(), 'en')
+
+    def test_locked(self):
+        activate('en')
+        with languages.locked('fr') as language_code:
+            self.assertEqual(language_code, 'fr')
+            self.assertEqual(languages.get_active(), 'fr')
+            with languages.locked('cs'):
+                self.assertEqual(languages.get_active(), 'cs')
+            self.assertEqual(languages.get_active(), 'fr')
+        self.assertFalse(languages.is_locked())
+
+        # Lock is released on error
+        try:
+            with languages.locked('fr'):
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(languages.is_locked())
+        self.assertRaises(ValueError, languages.locked('de').__enter__)
+        self.assertFalse(languages.is_locked())
+
+        @languages.locked('cs')
+        def get_active():
+            return languages.get_active()
+
+        self.assertEqual(get_active(), 'cs')
+        self.assertEqual(languages.get_active(), 'en')
+
+    def test_lock_threads(self):
+        # Locks are not shared between threads
+        result = {}
+
+        def worker():
+            result['before'] = languages.get_active()
+            with languages.locked('en'):
+                result['locked'] = languages.get_active()
+
+        with languages.locked('fr'):
+            thread = Thread(target=worker)
+            thread.start()
+            thread.join()
+            self.assertEqual(languages.get_active(), 'fr')
+        self.assertEqual(result, {'before': 'cs', 'locked': 'en'})
@@ -2,9 +2,11 @@
 """
 This tests standard behaviour of multilingual models
 """
-from django.db import models
+from django.core.exceptions import FieldError
+from django.db import connection, models
+from django.db.models import Count, F, Max, Min, Q
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils.translation import activate, deactivate_all
 
 from multilingual.models.base import MultilingualModel, MultilingualModelBase
@@ -317,6 +319,39 @@ class TestQueries(MultilingualSetupMixin, TestCase):
 
         self.assertQuerysetEqual(Article.objects.filter(translations__isnull=True), ['<Article: untranslated>'])
 
+    def test_has_translation(self):
+        from .ml_test_app.models import Article
+
+        result = ['<Article: first>', '<Article: only-czech>']
+        self.assertQuerysetEqual(Article.objects.has_translation(), result, ordered=False)
+        self.assertQuerysetEqual(Article.objects.has_translation('cs'), result, ordered=False)
+        result = ['<Article: first>', '<Article: only-english>']
+        self.assertQuerysetEqual(Article.objects.has_translation('en'), result, ordered=False)
+        self.assertQuerysetEqual(Article.objects.has_translation('fr'), [])
+        self.assertQuerysetEqual(Article.objects.filter(slug='first').has_translation('en'), ['<Article: first>'])
+        self.assertRaises(ValueError, Article.objects.has_translation, 'de')
+
+    def test_missing_translation(self):
+        from .ml_test_app.models import Article
+
+        result = ['<Article: only-english>', '<Article: untranslated>']
+        self.assertQuerysetEqual(Article.objects.missing_translation(), result, ordered=False)
+        self.assertQuerysetEqual(Article.objects.missing_translation('cs'), result, ordered=False)
+        result = ['<Article: only-czech>', '<Article: untranslated>']
+        self.assertQuerysetEqual(Article.objects.missing_translation('en'), result, ordered=False)
+        self.assertQuerysetEqual(Article.objects.missing_translation('cs').missing_translation('en'),
+                                 ['<Article: untranslated>'])
+        self.assertRaises(ValueError, Article.objects.missing_translation, 'de')
+
+    def test_translation_coverage(self):
+        from .ml_test_app.models import Article
+
+        with self.assertNumQueries(1):
+            coverage = Article.objects.translation_coverage()
+        self.assertEqual(coverage.items(), [('cs', 2), ('en', 2), ('en-us', 0), ('fr', 0)])
+        self.assertEqual(Article.objects.filter(slug__startswith='only').translation_coverage().items(),
+                         [('cs', 1), ('en', 1), ('en-us', 0), ('fr', 0)])
+
     def test_select_related(self):
         from .ml_test_app.models import Article
 
@@ -471,3 +506,310 @@ class TestQueries2(MultilingualSetupMixin, TestCase):
 
         self.assertQuerysetEqual(Article.objects.filter(content_cs__isnull=True), result, ordered=False)
         self.assertQuerysetEqual(Article.objects.filter(translation_cs__content__isnull=True), result, ordered=False)
+
+    def test_order_by_fallback(self):
+        from .ml_test_app.models import Article
+
+        Article.objects.create(slug='american', title_en_us='B', title_cs='D')
+        Article.objects.create(slug='english', title_en='C', title_cs='A')
+        Article.objects.create(slug='czech', title_cs='A')
+        Article.objects.create(slug='french', title_fr='A')
+
+        # Only default language is used for default language
+        result = ['<Article: french>', '<Article: czech>', '<Article: english>', '<Article: american>']
+        self.assertQuerysetEqual(Article.objects.order_by('title_any', 'slug'), result)
+
+        activate('en-us')
+        # Missing translations are sorted as NULL
+        result = ['<Article: french>', '<Article: czech>', '<Article: american>', '<Article: english>']
+        self.assertQuerysetEqual(Article.objects.order_by('title_any', 'slug'), result)
+        result = ['<Article: english>', '<Article: american>', '<Article: czech>', '<Article: french>']
+        self.assertQuerysetEqual(Article.objects.order_by('-title_any', '-slug'), result)
+
+        # Ordering works with other query features
+        self.assertQuerysetEqual(Article.objects.order_by('title_any').filter(slug__in=('american', 'english')),
+                                 ['<Article: american>', '<Article: english>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_en='C').order_by('title_any'), ['<Article: english>'])
+        self.assertEqual(list(Article.objects.order_by('-title_any', '-slug').values_list('slug', flat=True)),
+                         ['english', 'american', 'czech', 'french'])
+        self.assertEqual(list(Article.objects.order_by('-title_any', '-slug').values('slug')[:1]),
+                         [{'slug': 'english'}])
+        self.assertEqual(Article.objects.order_by('title_any')[1:3].count(), 2)
+        self.assertTrue(Article.objects.order_by('title_any').exists())
+        self.assertEqual(Article.objects.order_by('title_any').values().count(), 4)
+        self.assertEqual(Article.objects.order_by('-title_any', '-slug').values()[0], {'id': 2, 'slug': 'english'})
+        obj = Article.objects.order_by('-title_any').get(slug='english')
+        self.assertFalse(hasattr(obj, 'ml_fallback_title_any'))
+
+        # Ordering is done by single query
+        with self.assertNumQueries(1):
+            list(Article.objects.order_by('title_any'))
+
+        # Translations are joined only for the final ordering
+        with CaptureQueriesContext(connection) as captured:
+            list(Article.objects.order_by('title_any').order_by('slug'))
+        self.assertNotIn('JOIN', captured[0]['sql'])
+        with CaptureQueriesContext(connection) as captured:
+            Article.objects.order_by('title_any').count()
+        self.assertNotIn('JOIN', captured[0]['sql'])
+        # Compilation does not change the query
+        queryset = Article.objects.order_by('title_any')
+        list(queryset)
+        self.assertEqual((queryset.query.extra, queryset.query.alias_map), ({}, {}))
+
+    def test_filter_fallback(self):
+        from .ml_test_app.models import Article
+
+        Article.objects.create(slug='american', title_en_us='American title', title_cs='Czech title')
+        Article.objects.create(slug='english', title_en='English title', title_cs='Czech title')
+        Article.objects.create(slug='czech', title_cs='Czech title')
+        Article.objects.create(slug='french', title_fr='French title')
+
+        activate('en-us')
+        self.assertQuerysetEqual(Article.objects.filter(title_any='Czech title'), ['<Article: czech>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_any__icontains='TITLE').order_by('slug'),
+                                 ['<Article: american>', '<Article: czech>', '<Article: english>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_any__startswith='E'), ['<Article: english>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_any__in=('American title', 'English title'))
+                                 .order_by('slug'), ['<Article: american>', '<Article: english>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_any__isnull=True), ['<Article: french>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_any=None), ['<Article: french>'])
+        self.assertQuerysetEqual(Article.objects.exclude(title_any='Czech title').order_by('slug'),
+                                 ['<Article: american>', '<Article: english>', '<Article: french>'])
+        self.assertQuerysetEqual(Article.objects.exclude(title_any__isnull=True).order_by('slug'),
+                                 ['<Article: american>', '<Article: czech>', '<Article: english>'])
+        self.assertQuerysetEqual(
+            Article.objects.filter(Q(title_any__startswith='A') | Q(slug='french')).order_by('slug'),
+            ['<Article: american>', '<Article: french>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_any__contains='title', title_cs__isnull=True),
+                                 [])
+        self.assertQuerysetEqual(Article.objects.filter(slug__in=Article.objects.filter(title_any='Czech title')
+                                                        .values('slug')), ['<Article: czech>'])
+        self.assertRaises(FieldError, Article.objects.filter, title_any__title='Czech title')
+
+        # Filter on default language does not need fallbacks
+        deactivate_all()
+        self.assertQuerysetEqual(Article.objects.filter(title_any='Czech title').order_by('slug'),
+                                 ['<Article: american>', '<Article: czech>', '<Article: english>'])
+
+        # Filter is done by single query
+        activate('en-us')
+        with self.assertNumQueries(1):
+            list(Article.objects.filter(title_any__icontains='title'))
+
+    def test_filter_any_language(self):
+        from .ml_test_app.models import Article
+
+        Article.objects.create(slug='american', title_en_us='Word', title_cs='Slovo')
+        Article.objects.create(slug='english', title_en='Word', title_cs='Nic', content_cs='Word')
+        Article.objects.create(slug='czech', title_cs='Slovo')
+        Article.objects.create(slug='empty')
+
+        self.assertQuerysetEqual(Article.objects.filter(title__anylang__icontains='word').order_by('slug'),
+                                 ['<Article: american>', '<Article: english>'])
+        self.assertQuerysetEqual(Article.objects.filter(title__anylang='Slovo').order_by('slug'),
+                                 ['<Article: american>', '<Article: czech>'])
+        self.assertQuerysetEqual(Article.objects.exclude(title__anylang='Slovo').order_by('slug'),
+                                 ['<Article: empty>', '<Article: english>'])
+        self.assertQuerysetEqual(Article.objects.filter(Q(title__anylang='Word') | Q(content__anylang='Word'))
+                                 .order_by('slug'), ['<Article: american>', '<Article: english>'])
+        self.assertRaises(FieldError, Article.objects.filter, title_cs__anylang='Slovo')
+        self.assertRaises(FieldError, Article.objects.filter, title_any__anylang='Slovo')
+
+        self.assertQuerysetEqual(Article.objects.filter_any_language(title='Word').order_by('slug'),
+                                 ['<Article: american>', '<Article: english>'])
+        self.assertQuerysetEqual(Article.objects.filter_any_language(['en', 'fr'], title='Word'),
+                                 ['<Article: english>'])
+        # Lookups are applied on the same translation
+        self.assertQuerysetEqual(Article.objects.filter_any_language(title='Slovo', content__isnull=True)
+                                 .order_by('slug'), ['<Article: american>', '<Article: czech>'])
+        self.assertQuerysetEqual(Article.objects.filter_any_language(title='Word', content='Word'), [])
+        self.assertRaises(ValueError, Article.objects.filter_any_language, ['de'], title='Wort')
+
+        # Translations are not joined
+        with CaptureQueriesContext(connection) as captured:
+            list(Article.objects.filter(title__anylang__icontains='word'))
+        self.assertEqual(len(captured), 1)
+        self.assertNotIn('JOIN', captured[0]['sql'])
+
+        # Subquery uses database of the query, not database of translation manager
+        translation_model = Article._meta.translation_model
+        manager = translation_model._default_manager
+        translation_model._default_manager = manager.db_manager('other')
+        try:
+            self.assertQuerysetEqual(Article.objects.using('default').filter(title__anylang='Slovo').order_by('slug'),
+                                     ['<Article: american>', '<Article: czech>'])
+        finally:
+            translation_model._default_manager = manager
+
+    def test_join_reuse(self):
+        from .ml_test_app.models import Article
+
+        Article.objects.create(slug='first', title_cs='Prvni', content_cs='Obsah', title_en='First')
+        Article.objects.create(slug='second', title_cs='Druhy', title_en='First')
+
+        def get_sql(queryset):
+            with CaptureQueriesContext(connection) as captured:
+                result = list(queryset)
+            self.assertEqual(len(captured), 1)
+            return result, captured[0]['sql']
+
+        activate('cs')
+        # Proxy fields, relation for active language and explicit relation share the join
+        result, sql = get_sql(Article.objects.filter(title='Prvni').filter(translation__content='Obsah')
+                              .filter(translation_cs__title__startswith='P'))
+        self.assertEqual([a.slug for a in result], ['first'])
+        self.assertEqual(sql.count('JOIN'), 1)
+
+        result, sql = get_sql(Article.objects.select_related('translation').filter(title__startswith='D')
+                              .order_by('translation__title'))
+        self.assertEqual([a.slug for a in result], ['second'])
+        self.assertEqual(sql.count('JOIN'), 1)
+
+        result, sql = get_sql(Article.objects.filter(translation__title__isnull=False).exclude(content='Obsah')
+                              .order_by('title').values_list('slug', 'title_cs'))
+        self.assertEqual(result, [('second', 'Druhy')])
+        self.assertEqual(sql.count('JOIN'), 1)
+
+        # Each language is joined once
+        result, sql = get_sql(Article.objects.filter(title='Prvni', title_en='First').filter(title_en__isnull=False)
+                              .order_by('title_en', 'translation_cs__title'))
+        self.assertEqual([a.slug for a in result], ['first'])
+        self.assertEqual(sql.count('JOIN'), 2)
+
+    def test_aggregate(self):
+        from .ml_test_app.models import Article
+
+        Article.objects.create(slug='both', title_cs='Cesky', title_en='English', content_en='English')
+        Article.objects.create(slug='czech', title_cs='Zluty', content_cs='Obsah')
+        Article.objects.create(slug='english', title_en='Alpha', content_en='Content')
+        Article.objects.create(slug='empty')
+
+        activate('en-us')
+        self.assertEqual(Article.objects.aggregate(Count('title'), Count('title_cs'), Max('title_en'), Min('title_any')),
+                         {'title__count': 0, 'title_cs__count': 2, 'title_en__max': 'English',
+                          'title_any__min': 'Alpha'})
+        self.assertEqual(Article.objects.aggregate(count=Count('translation_en__title')), {'count': 2})
+
+        articles = Article.objects.annotate(count=Count('title_en')).order_by('slug').values_list('slug', 'count')
+        self.assertEqual(list(articles), [('both', 1), ('czech', 0), ('empty', 0), ('english', 1)])
+        articles = Article.objects.annotate(first=Max('title_any')).order_by('slug').values_list('slug', 'first')
+        self.assertEqual(list(articles),
+                         [('both', 'English'), ('czech', 'Zluty'), ('empty', None), ('english', 'Alpha')])
+
+        # F expressions
+        self.assertQuerysetEqual(Article.objects.filter(title_en=F('content_en')), ['<Article: both>'])
+        self.assertQuerysetEqual(Article.objects.filter(title_en=F('translation_en__content')), ['<Article: both>'])
+        self.assertQuerysetEqual(Article.objects.filter(content_any=F('title_en')), ['<Article: both>'])
+        self.assertQuerysetEqual(Article.objects.filter(content_cs=F('content_any')), ['<Article: czech>'])
+        self.assertQuerysetEqual(Article.objects.exclude(title_en=F('content_en')).order_by('slug'),
+                                 ['<Article: czech>', '<Article: empty>', '<Article: english>'])
+
+    def test_deferred_loading(self):
+        from .ml_test_app.models import Article
+
+        Article.objects.create(slug='first', title_cs='Prvni', content_cs='Obsah', title_en='First', content_en='Body')
+        Article.objects.create(slug='second', title_cs='Druhy', content_cs='Text')
+
+        def get_sql(queryset):
+            with CaptureQueriesContext(connection) as captured:
+                result = list(queryset)
+            self.assertEqual(len(captured), 1)
+            return result, captured[0]['sql']
+
+        activate('cs')
+        # Translations in select_related
+        result, sql = get_sql(Article.objects.select_related('translation').defer('content').order_by('slug'))
+        self.assertNotIn('content', sql)
+        self.assertEqual([a.title for a in result], ['Prvni', 'Druhy'])
+        with self.assertNumQueries(1):
+            self.assertEqual(result[0].content, 'Obsah')
+
+        result, sql = get_sql(Article.objects.select_related('translation_en').only('slug', 'title_en')
+                              .order_by('slug'))
+        self.assertNotIn('content', sql)
+        self.assertEqual([(a.slug, a.title_en) for a in result], [('first', 'First'), ('second', None)])
+
+        result, sql = get_sql(Article.objects.select_related('translation', 'translation_en').defer('content_any')
+                              .order_by('slug'))
+        self.assertNotIn('content', sql)
+
+        # Lazy loaded translations
+        obj = Article.objects.defer('content').get(slug='first')
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(obj.title, 'Prvni')
+            self.assertEqual(obj.title_en, 'First')
+        self.assertEqual(len(captured), 2)
+        self.assertNotIn('content', captured[0]['sql'])
+        self.assertNotIn('content', captured[1]['sql'])
+        self.assertEqual(obj.content, 'Obsah')
+
+        # Deferred translation can be saved
+        obj.title = 'Zmena'
+        obj.save()
+        obj = Article.objects.get(slug='first')
+        self.assertEqual((obj.title, obj.content), ('Zmena', 'Obsah'))
+
+        # Prefetched translations
+        with CaptureQueriesContext(connection) as captured:
+            result = list(Article.objects.prefetch_related('translation').only('slug', 'title').order_by('slug'))
+            self.assertEqual([a.title for a in result], ['Zmena', 'Druhy'])
+        self.assertEqual(len(captured), 2)
+        self.assertNotIn('content', captured[1]['sql'])
+        self.assertIn('."language_code" = ', captured[1]['sql'])
+
+        with self.assertNumQueries(2):
+            result = list(Article.objects.prefetch_related('translation_en').order_by('slug'))
+            self.assertEqual([a.title_en for a in result], ['First', None])
+
+    def test_language(self):
+        from .ml_test_app.models import Article
+
+        Article.objects.create(slug='first', title_cs='Prvni', title_en='First', content_en='Body')
+        Article.objects.create(slug='second', title_cs='Druhy', title_en='Second')
+        Article.objects.create(slug='czech', title_cs='Cesky')
+
+        activate('cs')
+        lock('fr')
+        try:
+            articles = Article.objects.language('en')
+            self.assertQuerysetEqual(articles.filter(title='First'), ['<Article: first>'])
+            self.assertEqual(list(articles.order_by('-title', 'slug').values_list('slug', 'title')),
+                             [('second', 'Second'), ('first', 'First'), ('czech', None)])
+            self.assertQuerysetEqual(articles.has_translation().order_by('slug'),
+                                     ['<Article: first>', '<Article: second>'])
+            self.assertEqual(Article.objects.language('en-us').filter(title_any='Cesky').get().slug, 'czech')
+
+            # Instances use the language
+            with self.assertNumQueries(1):
+                obj = articles.select_related('translation').get(slug='first')
+                self.assertEqual((obj.title, obj.content), ('First', 'Body'))
+                self.assertEqual(obj.translation.language_code, 'en')
+            self.assertEqual(obj.title_cs, 'Prvni')
+            with self.assertNumQueries(2):
+                result = list(articles.prefetch_related('translation').order_by('slug'))
+                self.assertEqual([a.title for a in result], [None, 'First', 'Second'])
+            obj = Article.objects.language('en-us').get(slug='second')
+            self.assertIsNone(obj.translation)
+            self.assertEqual(obj.title_any, 'Second')
+            obj.title = 'Druhy'
+            obj.save()
+        finally:
+            release()
+
+        obj = Article.objects.get(slug='second')
+        self.assertEqual((obj.title_en_us, obj.title_en, obj.title_cs), ('Druhy', 'Second', 'Druhy'))
+        self.assertRaises(ValueError, Article.objects.language, 'de')
+
+        # Language has to be set before lookups in active language
+        self.assertRaises(ValueError, Article.objects.filter(title='First').language, 'en')
+        self.assertRaises(ValueError, Article.objects.filter(slug=F('title')).language, 'en')
+        self.assertRaises(ValueError, Article.objects.order_by('title_any').language, 'en')
+        self.assertRaises(ValueError, Article.objects.only('title').language, 'en')
+        self.assertRaises(ValueError, Article.objects.select_related('translation').language, 'en')
+        self.assertRaises(ValueError, Article.objects.has_translation().language, 'en')
+        # Lookups in explicit language do not depend on active language
+        self.assertQuerysetEqual(Article.objects.filter(title_cs='Prvni').language('en').filter(title='First'),
+                                 ['<Article: first>'])
+        self.assertQuerysetEqual(Article.objects.has_translation('en').language('en').order_by('-title'),
+                                 ['<Article: second>', '<Article: first>'])
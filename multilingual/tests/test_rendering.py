@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Test rendering in several languages.
+"""
+from django.template import Template
+from django.test import TestCase
+from django.utils.translation import deactivate_all, get_language
+
+from multilingual.languages import get_active, is_locked
+from multilingual.rendering import prefetch_translations, render_languages, render_template_languages
+
+from .base import MultilingualSetupMixin
+
+
+class TestRendering(MultilingualSetupMixin, TestCase):
+    fixtures = ('ml_test_models.json', )
+
+    def setUp(self):
+        deactivate_all()
+
+    def test_render_languages(self):
+        result = render_languages(lambda: (get_active(), get_language()), ['en', 'fr', 'cs'], processes=2)
+        self.assertEqual(result.items(), [('en', ('en', 'en')), ('fr', ('fr', 'fr')), ('cs', ('cs', 'cs'))])
+        self.assertEqual(result.keys(), ['en', 'fr', 'cs'])
+        self.assertFalse(is_locked())
+
+        self.assertEqual(render_languages(get_active).keys(), ['cs', 'en', 'en-us', 'fr'])
+        self.assertEqual(render_languages(get_active, []), {})
+
+    def test_render_languages_error(self):
+        def func():
+            raise ValueError(get_active())
+
+        self.assertRaises(ValueError, render_languages, func, ['en'])
+
+    def test_render_template_languages(self):
+        from .ml_test_app.models import Article
+
+        template = Template('{% for a in articles %}{{ a.title_any|default:"-" }},{% endfor %}')
+        with self.assertNumQueries(1):
+            articles = prefetch_translations(Article.objects.order_by('slug'))
+            result = render_template_languages(template, {'articles': articles}, ['cs', 'en'])
+        self.assertEqual(result, {'cs': u'První článek,Český článek,-,-,',
+                                  'en': u'First article,Český článek,English article,-,'})
@@ -0,0 +1,54 @@
+"""
+Test template tags
+"""
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils.translation import activate, deactivate_all
+
+from multilingual import languages
+
+from .base import TEST_LANGUAGES
+
+
+@override_settings(LANGUAGE_CODE='cs', LANGUAGES=TEST_LANGUAGES)
+class TestMlLock(TestCase):
+    def tearDown(self):
+        deactivate_all()
+
+    def render(self, source, **context):
+        return Template('{% load multiling %}' + source).render(Context(context))
+
+    def test_lock(self):
+        activate('en')
+        self.assertEqual(self.render("{% ml_lock 'fr' %}{{ ML_LANGUAGE }}{% endml_lock %}"), 'fr')
+        self.assertEqual(self.render("{% ml_lock code as lang %}{{ lang }}{% endml_lock %}", code='cs'), 'cs')
+        self.assertFalse(languages.is_locked())
+
+    def test_lock_nested(self):
+        source = ("{% ml_lock 'fr' %}{{ ML_LANGUAGE }}{% ml_lock 'cs' %}{{ ML_LANGUAGE }}{% endml_lock %}"
+                  "{{ ML_LANGUAGE }}{% endml_lock %}")
+        with languages.locked('en'):
+            self.assertEqual(self.render(source), 'frcsfr')
+            self.assertEqual(languages.get_active(), 'en')
+        self.assertFalse(languages.is_locked())
+
+    def test_lock_filter(self):
+        source = "{% ml_lock code|lower as lang %}{{ lang }}{% endml_lock %}"
+        self.assertEqual(self.render(source, code='FR'), 'fr')
+
+    def test_lock_compiled(self):
+        # Literal language code is resolved at compile time
+        node = Template("{% load multiling %}{% ml_lock 'fr' %}{% endml_lock %}").nodelist[-1]
+        self.assertEqual(node.language_code, 'fr')
+        node = Template("{% load multiling %}{% ml_lock code %}{% endml_lock %}").nodelist[-1]
+        self.assertEqual(node.language_code.var.var, 'code')
+
+    def test_lock_invalid(self):
+        self.assertRaises(TemplateSyntaxError, self.render, "{% ml_lock 'de' %}{% endml_lock %}")
+        self.assertRaises(ValueError, self.render, "{% ml_lock code %}{% endml_lock %}", code='de')
+        self.assertRaises(ValueError, self.render, "{% ml_lock code %}{% endml_lock %}")
+        self.assertFalse(languages.is_locked())
+        self.assertRaises(TemplateSyntaxError, self.render, "{% ml_lock %}{% endml_lock %}")
+        self.assertRaises(TemplateSyntaxError, self.render, "{% ml_lock 'cs' lang %}{% endml_lock %}")
+        self.assertRaises(TemplateSyntaxError, self.render, "{% ml_lock 'cs' into lang %}{% endml_lock %}")